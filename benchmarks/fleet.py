@@ -0,0 +1,160 @@
+"""Benchmark the Mijia session paths against a fleet of simulated clocks.
+
+Run from the repository root:
+
+    python -m benchmarks.fleet --clocks 1,10,100
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# The driver doesn't need Home Assistant, import it on its own
+sys.path.insert(0, str(Path(__file__).parents[1] / "custom_components" / "mijia_thermometer_clock"))
+
+from mijia_clock.bulk import sync_time_on  # noqa: E402
+from mijia_clock.connection_manager import ConnectionManager  # noqa: E402
+from benchmarks.simulator import (  # noqa: E402
+    SimulatedAdapter,
+    SimulatedClock,
+    SimulatedMijia
+)
+
+
+class TaskCounter:
+    """Count the tasks created on the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.created = 0
+        loop.set_task_factory(self._factory)
+
+    def _factory(self, loop, coro, **kwargs):
+        self.created += 1
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+
+def build_fleet(args, count: int) -> list[SimulatedMijia]:
+    adapters = [
+        SimulatedAdapter(f"sim{index}", args.slots)
+        for index in range(args.adapters)
+    ]
+    connection_manager = ConnectionManager(args.slots)
+    instances = []
+    for index in range(count):
+        clock = SimulatedClock(
+            f"A4:C1:38:00:{index // 256:02X}:{index % 256:02X}",
+            connect_latency=args.latency,
+            failure_rate=args.failure_rate,
+            rssi=-50 - index % 40
+        )
+        instances.append(SimulatedMijia(clock, adapters, connection_manager=connection_manager))
+    return instances
+
+
+async def teardown(instances: list[SimulatedMijia]):
+    for instance in instances:
+        await instance.close()
+
+
+async def scenario_set_time(instances):
+    now = int(time.time())
+    await asyncio.gather(*(instance.set_time(now, 0) for instance in instances))
+
+
+async def scenario_set_use_fahrenheit(instances):
+    await asyncio.gather(*(instance.set_use_fahrenheit(True) for instance in instances))
+
+
+async def scenario_validation(instances):
+    # Mirrors MijiaTemperatureClockConfigFlow._validate_device
+    async def _validate(instance):
+        await instance.connect()
+        await instance.disconnect()
+    await asyncio.gather(*(_validate(instance) for instance in instances))
+
+
+async def scenario_bulk_sync(instances):
+    results = await sync_time_on(instances, int(time.time()), 0)
+    failures = [result for result in results if not result["success"]]
+    if failures:
+        raise RuntimeError(f"{len(failures)} clock(s) failed to sync")
+
+
+SCENARIOS = {
+    "set_time": scenario_set_time,
+    "set_use_fahrenheit": scenario_set_use_fahrenheit,
+    "validation": scenario_validation,
+    "bulk_sync": scenario_bulk_sync
+}
+
+
+async def run(args) -> list[dict]:
+    counter = TaskCounter(asyncio.get_running_loop())
+    results = []
+    for count in args.clocks:
+        for name in args.scenarios:
+            instances = build_fleet(args, count)
+            tasks_before = counter.created
+            start_time = time.perf_counter()
+            error = None
+            try:
+                await asyncio.wait_for(SCENARIOS[name](instances), args.timeout)
+            except asyncio.TimeoutError:
+                error = f"timed out after {args.timeout}s"
+            except Exception as e:
+                error = str(e)
+            wall_time = time.perf_counter() - start_time
+            tasks_created = counter.created - tasks_before
+            await teardown(instances)
+
+            adapters = next(iter(instances)).adapters.values()
+            results.append({
+                "scenario": name,
+                "clocks": count,
+                "wall_time": round(wall_time, 3),
+                "connections_opened": sum(i.clock.connections_opened for i in instances),
+                "tasks_created": tasks_created,
+                "peak_connections_per_adapter": max(a.peak_connections for a in adapters),
+                "error": error
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clocks", default="1,10,50,100",
+                        help="Comma separated fleet sizes")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma separated scenarios")
+    parser.add_argument("--adapters", type=int, default=3)
+    parser.add_argument("--slots", type=int, default=3,
+                        help="Connection slots per adapter")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Connect latency of each clock, in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=300,
+                        help="Maximum duration of a scenario, in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+    args.clocks = [int(count) for count in args.clocks.split(",")]
+    args.scenarios = args.scenarios.split(",")
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scenario':<20}{'clocks':>8}{'wall (s)':>10}{'conns':>8}{'tasks':>8}{'peak':>6}  error")
+    for result in results:
+        print(
+            f"{result['scenario']:<20}{result['clocks']:>8}{result['wall_time']:>10.3f}"
+            f"{result['connections_opened']:>8}{result['tasks_created']:>8}"
+            f"{result['peak_connections_per_adapter']:>6}  {result['error'] or ''}"
+        )
+
+
+if __name__ == "__main__":
+    main()
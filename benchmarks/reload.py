@@ -0,0 +1,386 @@
+"""Check that reloading clocks over and over doesn't leak memory or tasks.
+
+Each cycle sets up simulated clocks the way a config entry does, keeps them
+busy, and unloads them again. With `--hass`, the cycles set up and unload real
+config entries in a Home Assistant instance instead, so the bus listeners,
+Bluetooth callbacks, entities and the transition planner are checked too.
+Run from the repository root:
+
+    python -m benchmarks.reload --cycles 500 --clocks 5
+    python -m benchmarks.reload --cycles 500 --clocks 5 --hass
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+import weakref
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# The driver doesn't need Home Assistant, import it on its own
+sys.path.insert(0, str(Path(__file__).parents[1] / "custom_components" / "mijia_thermometer_clock"))
+
+from mijia_clock.connection_manager import ConnectionManager  # noqa: E402
+from mijia_clock.const import (  # noqa: E402
+    CONFIG_UPDATED,
+    DEVICE_CONNECTED,
+    DEVICE_DISCONNECTED,
+    READINGS_UPDATED,
+    STATS_UPDATED
+)
+from mijia_clock.device_store import DeviceStateStore  # noqa: E402
+from benchmarks.simulator import (  # noqa: E402
+    SimulatedAdapter,
+    SimulatedClock,
+    SimulatedMijia
+)
+
+
+class FakeEntity:
+    """Subscribes to the events of a clock like the entities of an entry do."""
+
+    def __init__(self, instance: SimulatedMijia):
+        self.updates = 0
+        self._unsubs = [
+            instance.eventbus.add_listener(event, self.on_event)
+            for event in (
+                CONFIG_UPDATED,
+                DEVICE_CONNECTED,
+                DEVICE_DISCONNECTED,
+                READINGS_UPDATED,
+                STATS_UPDATED
+            )
+        ]
+
+    def on_event(self, instance):
+        self.updates += 1
+
+    def remove(self):
+        while self._unsubs:
+            self._unsubs.pop()()
+
+
+async def exercise(instances: list[SimulatedMijia]):
+    """Leave behind what a running entry has in flight.
+
+    That is a held connection waiting for its idle disconnect, a background
+    write and a stream.
+    """
+    await asyncio.gather(*(
+        instance.set_time(int(time.time()), 0)
+        for instance in instances
+    ))
+    for index, instance in enumerate(instances):
+        instance.set_use_fahrenheit_optimistic(index % 2 == 0)
+        instance.schedule_connect_if_needed()
+        if index % 3 == 0:
+            try:
+                await instance.start_streaming()
+            except Exception:
+                pass
+
+
+class Fleet:
+    """The state shared by all entries, which outlives every reload."""
+
+    def __init__(self, args):
+        self.args = args
+        self.adapters = [
+            SimulatedAdapter(f"sim{index}", args.slots)
+            for index in range(args.adapters)
+        ]
+        self.connection_manager = ConnectionManager(args.slots)
+        self.device_store = DeviceStateStore()
+        self.clocks = [
+            SimulatedClock(
+                f"A4:C1:38:00:{index // 256:02X}:{index % 256:02X}",
+                connect_latency=args.latency,
+                gatt_latency=args.latency / 5,
+                rssi=-50 - index % 40
+            )
+            for index in range(args.clocks)
+        ]
+        self.live_instances: weakref.WeakSet[SimulatedMijia] = weakref.WeakSet()
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def reload(self):
+        """Set up every clock, use it and unload it again."""
+        entries = []
+        for clock in self.clocks:
+            instance = SimulatedMijia(
+                clock,
+                self.adapters,
+                connection_manager=self.connection_manager,
+                device_store=self.device_store
+            )
+            self.live_instances.add(instance)
+            entries.append((instance, [FakeEntity(instance) for _ in range(4)]))
+
+        await exercise([instance for instance, _entities in entries])
+
+        # Unload, mirroring async_unload_entry
+        for instance, entities in entries:
+            for entity in entities:
+                entity.remove()
+            await instance.close()
+
+    def measure(self) -> dict:
+        return {
+            "slots_held": sum(
+                len(self.connection_manager.adapter(adapter.source).holders)
+                for adapter in self.adapters
+            )
+        }
+
+
+class HassFleet(Fleet):
+    """Reloads real config entries of the integration in Home Assistant.
+
+    The clocks are reached through the simulated adapters instead of the
+    Bluetooth integration, whose callbacks are collected so advertisements
+    can be fed to the entries. Entities the state publisher holds on to are
+    reported as alive.
+    """
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.hass = None
+        self.entries = []
+        self.domain_data = None
+        self.bluetooth_callbacks = []
+        self.live_entities = weakref.WeakSet()
+        self._clocks_by_mac = {clock.mac: clock for clock in self.clocks}
+        self._config_dir = tempfile.TemporaryDirectory()
+        self._patches = ExitStack()
+
+    async def start(self):
+        # Home Assistant is only needed for this mode. Its core has to be
+        # imported before the loader.
+        from homeassistant.core import HomeAssistant
+        from homeassistant import loader
+        from homeassistant.components import bluetooth
+        from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntries
+        from homeassistant.const import CONF_MAC, CONF_NAME
+        from homeassistant.helpers import (
+            area_registry,
+            category_registry,
+            device_registry,
+            entity_registry,
+            floor_registry,
+            issue_registry,
+            label_registry
+        )
+        import custom_components.mijia_thermometer_clock as integration
+
+        logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+        self.hass = hass = HomeAssistant(self._config_dir.name)
+        hass.config.skip_pip = True
+        loader.async_setup(hass)
+        await asyncio.gather(*(
+            registry.async_load(hass)
+            for registry in (
+                area_registry,
+                category_registry,
+                device_registry,
+                entity_registry,
+                floor_registry,
+                issue_registry,
+                label_registry
+            )
+        ))
+        hass.config_entries = ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        # The radio is simulated and the recorder isn't used by the entries
+        hass.config.components.update({"bluetooth", "bluetooth_adapters", "recorder"})
+        await hass.async_start()
+
+        self._patches.enter_context(patch.object(
+            bluetooth,
+            "async_register_callback",
+            self._register_bluetooth_callback
+        ))
+        self._patches.enter_context(patch.object(integration, "Mijia", self._create_instance))
+
+        # Creating the entries sets them up, the cycles start unloaded
+        for clock in self.clocks:
+            await hass.config_entries.flow.async_init(
+                integration.DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={CONF_MAC: clock.mac, CONF_NAME: f"Clock {clock.mac[-5:].replace(':', '')}"}
+            )
+        self.entries = hass.config_entries.async_entries(integration.DOMAIN)
+        self.domain_data = hass.data[integration.DOMAIN]
+        for entry in self.entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+
+    async def stop(self):
+        await self.hass.async_stop()
+        self._patches.close()
+        self._config_dir.cleanup()
+
+    def _register_bluetooth_callback(self, hass, callback, matcher, mode):
+        self.bluetooth_callbacks.append(callback)
+        return lambda: self.bluetooth_callbacks.remove(callback)
+
+    def _create_instance(self, mac, name, resolver=None, **kwargs) -> SimulatedMijia:
+        instance = SimulatedMijia(self._clocks_by_mac[mac], self.adapters, **kwargs)
+        self.live_instances.add(instance)
+        return instance
+
+    async def reload(self):
+        from homeassistant.helpers.entity_platform import async_get_platforms
+
+        hass = self.hass
+        for entry in self.entries:
+            await hass.config_entries.async_setup(entry.entry_id)
+        for platform in async_get_platforms(hass, self.entries[0].domain):
+            self.live_entities.update(platform.entities.values())
+
+        for index, callback in enumerate(self.bluetooth_callbacks):
+            adapter = self.adapters[index % len(self.adapters)]
+            callback(SimpleNamespace(service_data={}, rssi=-60, source=adapter.source), None)
+        await exercise([entry.runtime_data for entry in self.entries])
+
+        for entry in self.entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+
+        # Home Assistant keeps the emptied entity platforms of unloaded entries
+        # registered. That growth is its own, not the integration's.
+        platforms = async_get_platforms(hass, self.entries[0].domain)
+        platforms[:] = [platform for platform in platforms if platform.entities]
+
+    def measure(self) -> dict:
+        connection_manager = self.domain_data.connection_manager
+        return {
+            "slots_held": sum(len(slots["in_use"]) for slots in connection_manager.diagnostics().values()),
+            "listeners": sum(self.hass.bus.async_listeners().values()),
+            "callbacks": len(self.bluetooth_callbacks),
+            "entities": len(self.live_entities),
+            "planner": int(self.domain_data.transition_planner.running)
+        }
+
+
+def measure(fleet: Fleet) -> dict:
+    gc.collect()
+    current_task = asyncio.current_task()
+    return {
+        "memory": tracemalloc.get_traced_memory()[0],
+        "tasks": sum(1 for task in asyncio.all_tasks() if task is not current_task),
+        "instances": len(fleet.live_instances),
+        **fleet.measure()
+    }
+
+
+async def run(args) -> dict:
+    fleet = HassFleet(args) if args.hass else Fleet(args)
+    await fleet.start()
+    tracemalloc.start()
+    samples = []
+    baseline = None
+    for cycle in range(1, args.warmup + args.cycles + 1):
+        await fleet.reload()
+        # Let cancelled tasks finish unwinding
+        await asyncio.sleep(args.latency * 10)
+        sample = {"cycle": cycle, **measure(fleet)}
+        if cycle == args.warmup:
+            baseline = sample
+        if cycle > args.warmup and (cycle - args.warmup) % args.sample_every == 0:
+            samples.append(sample)
+    tracemalloc.stop()
+    await fleet.stop()
+
+    final = samples[-1]
+    failures = []
+    growth = final["memory"] - baseline["memory"]
+    if growth > args.max_growth * 1024:
+        failures.append(f"memory grew by {growth / 1024:.1f} KiB over {args.cycles} reloads")
+    if final["tasks"] > baseline["tasks"]:
+        failures.append(f"{final['tasks'] - baseline['tasks']} task(s) left running")
+    if final["instances"]:
+        failures.append(f"{final['instances']} unloaded instance(s) still alive")
+    if final["slots_held"]:
+        failures.append(f"{final['slots_held']} adapter slot(s) still held")
+    if final.get("listeners", 0) > baseline.get("listeners", 0):
+        failures.append(f"{final['listeners'] - baseline['listeners']} bus listener(s) left registered")
+    if final.get("callbacks"):
+        failures.append(f"{final['callbacks']} Bluetooth callback(s) left registered")
+    if final.get("entities"):
+        failures.append(f"{final['entities']} removed entit(y/ies) still alive")
+    if final.get("planner"):
+        failures.append("transition planner still running with every entry unloaded")
+
+    return {
+        "baseline": baseline,
+        "samples": samples,
+        "memory_growth": growth,
+        "failures": failures
+    }
+
+
+COLUMNS = [
+    ("tasks", "tasks"),
+    ("instances", "alive"),
+    ("slots_held", "slots"),
+    ("listeners", "listeners"),
+    ("callbacks", "callbacks"),
+    ("entities", "entities"),
+    ("planner", "planner")
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=500, help="Number of reloads to check")
+    parser.add_argument("--warmup", type=int, default=20,
+                        help="Reloads before the baseline is taken")
+    parser.add_argument("--clocks", type=int, default=5)
+    parser.add_argument("--adapters", type=int, default=2)
+    parser.add_argument("--slots", type=int, default=3,
+                        help="Connection slots per adapter")
+    parser.add_argument("--latency", type=float, default=0.001,
+                        help="Connect latency of each clock, in seconds")
+    parser.add_argument("--max-growth", type=float, default=256,
+                        help="Allowed memory growth after the warmup, in KiB")
+    parser.add_argument("--sample-every", type=int, default=50,
+                        help="Reloads between reported samples")
+    parser.add_argument("--hass", action="store_true",
+                        help="Reload real config entries in a Home Assistant instance")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+    args.sample_every = min(args.sample_every, args.cycles)
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        columns = [
+            (key, header)
+            for key, header in COLUMNS
+            if key in results["baseline"]
+        ]
+        print(f"{'cycle':>8}{'memory (KiB)':>14}" + "".join(f"{header:>10}" for _key, header in columns))
+        for sample in [results["baseline"], *results["samples"]]:
+            print(
+                f"{sample['cycle']:>8}{sample['memory'] / 1024:>14.1f}"
+                + "".join(f"{sample[key]:>10}" for key, _header in columns)
+            )
+        for failure in results["failures"]:
+            print(f"LEAK: {failure}")
+    sys.exit(1 if results["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
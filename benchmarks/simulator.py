@@ -0,0 +1,273 @@
+"""In-process simulation of LYWSD02MMC clocks, used to exercise `Mijia` without hardware.
+
+Expects the `mijia_clock` driver to be importable, the benchmarks add it to
+the path before importing this module.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from struct import pack, unpack_from
+
+from mijia_clock.history import RECORD_FORMAT
+from mijia_clock.mijia import (
+    Mijia,
+    DATA_CHAR,
+    HISTORY_CHAR,
+    NUM_RECORDS_CHAR,
+    RECORD_IDX_CHAR,
+    SETTINGS_CHAR,
+    TIME_CHAR
+)
+from mijia_clock.routing import ConnectionPath
+
+
+class SimulatedConnectionError(Exception):
+    """Error raised when a simulated connection attempt fails."""
+    pass
+
+
+@dataclass
+class FakeGATTCharacteristic:
+    uuid: str
+    handle: int
+    properties: list[str] = field(default_factory=lambda: ["read", "write"])
+
+
+class FakeServices:
+    def __init__(self, characteristics: list[FakeGATTCharacteristic]):
+        self._characteristics = {char.uuid.lower(): char for char in characteristics}
+
+    def get_characteristic(self, specifier):
+        if isinstance(specifier, FakeGATTCharacteristic):
+            return specifier
+        return self._characteristics.get(str(specifier).lower())
+
+
+class SimulatedAdapter:
+    """A Bluetooth adapter or proxy with a limited number of connection slots."""
+
+    def __init__(self, source: str = "sim0", slots: int = 3):
+        self.source = source
+        self.slots = slots
+        self.connected: set[str] = set()
+        self.peak_connections = 0
+
+
+class SimulatedClock:
+    """State of a single simulated LYWSD02MMC clock."""
+
+    def __init__(
+        self,
+        mac: str,
+        connect_latency: float = 0.05,
+        gatt_latency: float = 0.01,
+        failure_rate: float = 0.0,
+        drift_rate: float = 0.0,
+        rssi: int = -60
+    ):
+        self.mac = mac
+        self.connect_latency = connect_latency
+        self.gatt_latency = gatt_latency
+        self.failure_rate = failure_rate
+        self.drift_rate = drift_rate
+        self.rssi = rssi
+        self.settings = b"\xff"
+        self.temperature = 21.5
+        self.humidity = 45
+        # Packed history records, the oldest first
+        self.history: list[bytes] = []
+        self.history_index = 0
+        self.timezone_offset = 0
+        self.connections_opened = 0
+        self.reads = 0
+        self.writes = 0
+        self._time_base = time.time()
+        self._time_set_at = time.monotonic()
+        self.services = FakeServices([
+            FakeGATTCharacteristic(TIME_CHAR, 0x21),
+            FakeGATTCharacteristic(SETTINGS_CHAR, 0x2A),
+            FakeGATTCharacteristic(DATA_CHAR, 0x35, ["read", "notify"]),
+            FakeGATTCharacteristic(NUM_RECORDS_CHAR, 0x2D, ["read"]),
+            FakeGATTCharacteristic(RECORD_IDX_CHAR, 0x2F, ["read", "write"]),
+            FakeGATTCharacteristic(HISTORY_CHAR, 0x33, ["read", "notify"])
+        ])
+
+    @property
+    def timestamp(self) -> float:
+        elapsed = time.monotonic() - self._time_set_at
+        return self._time_base + elapsed * (1 + self.drift_rate)
+
+    def read(self, uuid: str) -> bytes:
+        self.reads += 1
+        if uuid == TIME_CHAR.lower():
+            return pack("<Ib", int(self.timestamp), self.timezone_offset)
+        if uuid == SETTINGS_CHAR.lower():
+            return self.settings
+        if uuid == DATA_CHAR.lower():
+            return self.data
+        if uuid == NUM_RECORDS_CHAR.lower():
+            return pack("<II", len(self.history), max(len(self.history) - 1, 0))
+        if uuid == RECORD_IDX_CHAR.lower():
+            return pack("<I", self.history_index)
+        raise KeyError(uuid)
+
+    def add_history_record(
+        self,
+        timestamp: int,
+        max_temperature: float,
+        max_humidity: int,
+        min_temperature: float,
+        min_humidity: int
+    ) -> None:
+        self.history.append(pack(
+            RECORD_FORMAT,
+            len(self.history),
+            timestamp,
+            round(max_temperature * 100),
+            max_humidity,
+            round(min_temperature * 100),
+            min_humidity
+        ))
+
+    @property
+    def data(self) -> bytes:
+        return pack("<hB", round(self.temperature * 100), self.humidity)
+
+    def write(self, uuid: str, data: bytes) -> None:
+        self.writes += 1
+        if uuid == TIME_CHAR.lower():
+            timestamp, self.timezone_offset = unpack_from("<Ib", data)
+            self._time_base = timestamp
+            self._time_set_at = time.monotonic()
+        elif uuid == SETTINGS_CHAR.lower():
+            self.settings = bytes(data)
+        elif uuid == RECORD_IDX_CHAR.lower():
+            self.history_index = unpack_from("<I", data)[0]
+        else:
+            raise KeyError(uuid)
+
+
+class FakeBleakClient:
+    """The subset of `BleakClientWithServiceCache` used by `Mijia`."""
+
+    def __init__(self, clock: SimulatedClock, adapter: SimulatedAdapter, disconnected_callback=None):
+        self._clock = clock
+        self._adapter = adapter
+        self._disconnected_callback = disconnected_callback
+        self.is_connected = False
+        self.services = clock.services
+        self.notify_callbacks = {}
+
+    async def connect(self, **kwargs) -> bool:
+        await asyncio.sleep(self._clock.connect_latency)
+        if len(self._adapter.connected) >= self._adapter.slots:
+            raise SimulatedConnectionError(f"No free connection slot on {self._adapter.source}")
+        if random.random() < self._clock.failure_rate:
+            raise SimulatedConnectionError(f"Simulated connection failure to {self._clock.mac}")
+
+        self.is_connected = True
+        self._clock.connections_opened += 1
+        self._adapter.connected.add(self._clock.mac)
+        self._adapter.peak_connections = max(
+            self._adapter.peak_connections,
+            len(self._adapter.connected)
+        )
+        return True
+
+    async def disconnect(self) -> bool:
+        if not self.is_connected:
+            return True
+        self.is_connected = False
+        self.notify_callbacks.clear()
+        self._adapter.connected.discard(self._clock.mac)
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+        return True
+
+    async def clear_cache(self) -> bool:
+        return True
+
+    async def read_gatt_char(self, char_specifier) -> bytearray:
+        self._ensure_connected()
+        await asyncio.sleep(self._clock.gatt_latency)
+        return bytearray(self._clock.read(self._resolve(char_specifier)))
+
+    async def write_gatt_char(self, char_specifier, data, response: bool = True) -> None:
+        self._ensure_connected()
+        if response:
+            await asyncio.sleep(self._clock.gatt_latency)
+        uuid = self._resolve(char_specifier)
+        self._clock.write(uuid, data)
+        # Writing the record index starts streaming the history from there
+        if uuid == RECORD_IDX_CHAR.lower() and HISTORY_CHAR.lower() in self.notify_callbacks:
+            asyncio.get_running_loop().create_task(self._send_history())
+
+    async def start_notify(self, char_specifier, callback) -> None:
+        self._ensure_connected()
+        uuid = self._resolve(char_specifier)
+        self.notify_callbacks[uuid] = callback
+        # The clock sends its current readings right after subscribing
+        if uuid == DATA_CHAR.lower():
+            callback(char_specifier, bytearray(self._clock.read(uuid)))
+
+    async def stop_notify(self, char_specifier) -> None:
+        self._ensure_connected()
+        self.notify_callbacks.pop(self._resolve(char_specifier), None)
+
+    async def _send_history(self):
+        for record in self._clock.history[self._clock.history_index:]:
+            await asyncio.sleep(self._clock.gatt_latency / 10)
+            callback = self.notify_callbacks.get(HISTORY_CHAR.lower())
+            if callback is None:
+                return
+            callback(HISTORY_CHAR, bytearray(record))
+
+    def _ensure_connected(self):
+        if not self.is_connected:
+            raise SimulatedConnectionError("Not connected")
+
+    def _resolve(self, char_specifier) -> str:
+        characteristic = self.services.get_characteristic(char_specifier)
+        if characteristic is None:
+            raise KeyError(char_specifier)
+        return characteristic.uuid.lower()
+
+
+class SimulatedMijia(Mijia):
+    """`Mijia` talking to a `SimulatedClock` through simulated adapters."""
+
+    def __init__(
+        self,
+        clock: SimulatedClock,
+        adapters: list[SimulatedAdapter],
+        **kwargs
+    ):
+        super().__init__(
+            clock.mac,
+            f"Simulated {clock.mac}",
+            resolver=self._resolve,
+            **kwargs
+        )
+        self.clock = clock
+        self.adapters = {adapter.source: adapter for adapter in adapters}
+
+    async def _resolve(self, mac: str) -> list[ConnectionPath]:
+        return [
+            ConnectionPath(source, self.clock, self.clock.rssi)
+            for source in self.adapters
+        ]
+
+    async def _establish_connection(
+        self,
+        path: ConnectionPath,
+        use_services_cache: bool
+    ) -> FakeBleakClient:
+        client = FakeBleakClient(
+            path.device,
+            self.adapters[path.source],
+            disconnected_callback=self._on_disconnect
+        )
+        await client.connect()
+        return client
@@ -4,19 +4,65 @@ from __future__ import annotations
 import logging
 
 from homeassistant.components.bluetooth.match import ADDRESS, BluetoothCallbackMatcher
-from homeassistant.const import Platform, CONF_MAC, CONF_NAME
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform, CONF_MAC, CONF_NAME
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.components import bluetooth
-
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_BINDKEY,
+    CONF_IDLE_POLICY,
+    CONF_IDLE_TIMEOUT,
+    CONF_WRITE_WITHOUT_RESPONSE,
+    DOMAIN,
+    DISCONNECT_DELAY,
+    IDLE_HOLD_MIN,
+    IDLE_POLICY_ADAPTIVE,
+    IDLE_POLICY_FIXED,
+    XIAOMI_INC
+)
+from .data import (
+    async_apply_domain_options,
+    async_get_domain_data,
+    async_load_domain_data
+)
 from .mijia_clock import Mijia
+from .mijia_clock.idle import AdaptiveIdle, FixedIdle, IdlePolicy
+from .mijia_clock.trace import OP_ADVERTISEMENT
+from .resolver import HassDeviceResolver
+from .history import async_stop_history_sync, async_update_history_sync
 from .services import async_register_services
+from .streaming import async_stop_streaming, async_update_streaming
+from .time_sync import async_stop_time_sync, async_update_time_sync
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [
     Platform.SWITCH,
-    Platform.BINARY_SENSOR
+    Platform.BINARY_SENSOR,
+    Platform.SENSOR
 ]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+def _get_bindkey(entry: ConfigEntry) -> bytes | None:
+    bindkey = entry.options.get(CONF_BINDKEY)
+    return bytes.fromhex(bindkey) if bindkey else None
+
+
+def _get_idle_policy(entry: ConfigEntry) -> IdlePolicy:
+    idle_timeout = entry.options.get(CONF_IDLE_TIMEOUT, DISCONNECT_DELAY)
+    if entry.options.get(CONF_IDLE_POLICY, IDLE_POLICY_ADAPTIVE) == IDLE_POLICY_FIXED:
+        return FixedIdle(idle_timeout)
+    return AdaptiveIdle(min(IDLE_HOLD_MIN, idle_timeout), idle_timeout)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the parts shared by all clocks."""
+    await async_load_domain_data(hass)
+    async_register_services(hass)
+    return True
 
 
 async def async_setup_entry(
@@ -28,13 +74,20 @@ async def async_setup_entry(
     mac = entry.options.get(CONF_MAC, None) or entry.data.get(CONF_MAC, None)
     name = entry.options.get(CONF_NAME, None) or entry.data.get(CONF_NAME, None)
 
-    instance = Mijia(hass, mac, name)
+    domain_data = await async_load_domain_data(hass)
+    instance = Mijia(
+        mac,
+        name,
+        resolver=HassDeviceResolver(hass),
+        connection_manager=domain_data.connection_manager,
+        bindkey=_get_bindkey(entry),
+        device_store=domain_data.device_store,
+        write_without_response=entry.options.get(CONF_WRITE_WITHOUT_RESPONSE, False),
+        idle_policy=_get_idle_policy(entry)
+    )
     entry.runtime_data = instance
-
-    async_register_services(hass)
-
-    async def _connect_if_needed():
-        await instance.connect_if_needed()
+    async_apply_domain_options(hass)
+    startup = domain_data.startup_scheduler
 
     @callback
     def _async_discovered_device(
@@ -42,8 +95,28 @@ async def async_setup_entry(
         change: bluetooth.BluetoothChange
     ):
         """Subscribe to bluetooth changes."""
+        service_data = service_info.service_data.get(XIAOMI_INC)
+        # Every proxy in range relays the same frame, only handle it once
+        if service_data and instance.deduplicator.is_duplicate(
+            service_data,
+            service_info.rssi,
+            service_info.source
+        ):
+            return
+
         _LOGGER.debug("New service_info: %s", service_info)
-        hass.loop.create_task(_connect_if_needed())
+        # The device is in range again, allow connecting to it
+        instance.circuit_breaker.reset()
+        if service_data:
+            instance.trace.record(
+                OP_ADVERTISEMENT,
+                data=service_data,
+                adapter=service_info.source,
+                rssi=service_info.rssi
+            )
+            instance.handle_advertisement(service_data)
+        if not startup.is_pending(entry.entry_id):
+            instance.schedule_connect_if_needed()
 
     entry.async_on_unload(
         bluetooth.async_register_callback(
@@ -55,6 +128,27 @@ async def async_setup_entry(
     )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    @callback
+    def _async_start() -> None:
+        async_update_time_sync(hass, entry)
+        async_update_streaming(hass, entry)
+        async_update_history_sync(hass, entry)
+        instance.schedule_connect_if_needed()
+
+    startup.async_schedule(entry, _async_start)
+
+    # The planner serves every clock, it runs while any of them is loaded
+    planner = domain_data.transition_planner
+    if not planner.running:
+        planner.async_start()
+
+    @callback
+    def _async_stop_planner(_event: Event) -> None:
+        planner.async_stop()
+
+    entry.async_on_unload(hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_stop_planner))
+    entry.async_on_unload(lambda: startup.async_cancel(entry.entry_id))
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
@@ -64,11 +158,36 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         instance: Mijia = entry.runtime_data
-        await instance.disconnect()
+        async_stop_time_sync(hass, entry)
+        async_stop_streaming(hass, entry)
+        async_stop_history_sync(hass, entry)
+        planner = async_get_domain_data(hass).transition_planner
+        planner.async_forget(instance)
+        if not any(
+            other.state is ConfigEntryState.LOADED
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id != entry.entry_id
+        ):
+            planner.async_stop()
+        await instance.close()
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the stored state of a removed device."""
+    mac = entry.options.get(CONF_MAC, None) or entry.data.get(CONF_MAC, None)
+    domain_data = await async_load_domain_data(hass)
+    domain_data.device_store.remove(mac)
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     instance: Mijia = entry.runtime_data
+    async_apply_domain_options(hass)
+    instance.set_bindkey(_get_bindkey(entry))
+    instance.write_without_response = entry.options.get(CONF_WRITE_WITHOUT_RESPONSE, False)
+    instance.idle_policy = _get_idle_policy(entry)
+    if not async_get_domain_data(hass).startup_scheduler.is_pending(entry.entry_id):
+        async_update_time_sync(hass, entry)
+        async_update_streaming(hass, entry)
+        async_update_history_sync(hass, entry)
     if entry.title != instance.name:
         await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
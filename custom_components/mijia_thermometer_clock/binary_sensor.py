@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.const import CONF_NAME
 from homeassistant.helpers.entity import EntityCategory, DeviceInfo
 
-from .entity import async_device_device_info_fn
+from .entity import async_device_device_info_fn, async_get_state_publisher
 from .mijia_clock import Mijia
 from .const import DEVICE_CONNECTED, DEVICE_DISCONNECTED
 
@@ -29,19 +30,24 @@ class MijiaConnectedBinarySensor(BinarySensorEntity):
         self._attr_is_on = False
         self._attr_icon = "mdi:bluetooth-off"
 
-        instance.eventbus.add_listener(DEVICE_CONNECTED, self.on_connect)
-        instance.eventbus.add_listener(DEVICE_DISCONNECTED, self.on_disconnect)
+    async def async_added_to_hass(self) -> None:
+        self._publisher = async_get_state_publisher(self)
+        eventbus = self._instance.eventbus
+        self.async_on_remove(eventbus.add_listener(DEVICE_CONNECTED, self.on_connect))
+        self.async_on_remove(eventbus.add_listener(DEVICE_DISCONNECTED, self.on_disconnect))
 
     @property
     def device_info(self) -> DeviceInfo:
         return async_device_device_info_fn(self._instance, self._config_entry.data[CONF_NAME])
 
-    async def on_connect(self, instance: Mijia):
+    @callback
+    def on_connect(self, instance: Mijia):
         self._attr_is_on = True
         self._attr_icon = "mdi:bluetooth-connect"
-        self.schedule_update_ha_state()
+        self._publisher.async_publish(self)
 
-    async def on_disconnect(self, instance: Mijia):
+    @callback
+    def on_disconnect(self, instance: Mijia):
         self._attr_is_on = False
         self._attr_icon = "mdi:bluetooth-off"
-        self.schedule_update_ha_state()
+        self._publisher.async_publish(self)
@@ -2,26 +2,75 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult, FlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    FlowResult,
+    SOURCE_IMPORT,
+    OptionsFlow
+)
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import format_mac
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.const import CONF_MAC, CONF_NAME
 from homeassistant.components.bluetooth import (
-    async_discovered_service_info
+    BluetoothServiceInfoBleak,
+    async_discovered_service_info,
+    async_last_service_info
 )
 
-from .mijia_clock import Mijia
-from .const import DOMAIN
+from .data import async_load_domain_data
+from .mijia_clock import Mijia, NotConnectedError
+from .mijia_clock.device_store import DeviceStateStore
+from .resolver import HassDeviceResolver
+from .const import (
+    DOMAIN,
+    XIAOMI_INC,
+    CONF_BINDKEY,
+    CONF_WRITE_WITHOUT_RESPONSE,
+    CONF_AUTO_TIME_SYNC,
+    CONF_TRANSITION_SYNC,
+    CONF_STREAMING,
+    CONF_STREAM_DURATION,
+    CONF_STREAM_INTERVAL,
+    CONF_HISTORY_SYNC,
+    CONF_IDLE_POLICY,
+    CONF_IDLE_TIMEOUT,
+    CONF_STARTUP_WINDOW,
+    CONF_FAST_VALIDATION,
+    CONF_MACS,
+    SUPPORTED_PRODUCT_IDS,
+    BULK_VALIDATION_CONCURRENCY,
+    CONF_MAX_CONNECTIONS_PER_ADAPTER,
+    DEFAULT_MAX_CONNECTIONS_PER_ADAPTER,
+    DEFAULT_STARTUP_WINDOW,
+    DEFAULT_STREAM_DURATION,
+    DEFAULT_STREAM_INTERVAL,
+    DISCONNECT_DELAY,
+    IDLE_POLICY_ADAPTIVE,
+    IDLE_POLICY_FIXED
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-XIAOMI_INC = "0000fe95-0000-1000-8000-00805f9b34fb"
 MANUAL_MAC = "manual_mac"
+BULK_ADD = "bulk_add"
+
+
+def _is_valid_bindkey(bindkey: str) -> bool:
+    try:
+        return len(bytes.fromhex(bindkey)) == 16
+    except ValueError:
+        return False
 
 
 class MijiaTemperatureClockConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -32,25 +81,108 @@ class MijiaTemperatureClockConfigFlow(ConfigFlow, domain=DOMAIN):
     def __init__(self):
         self.mac = None
         self.name = "Mijia Temperature and Humidity Monitor Clock"
+        self._discovered_devices: dict[str, BluetoothServiceInfoBleak] | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        return MijiaOptionsFlow()
 
     def _is_device_supported(self, device_info):
         service_data = device_info.service_data.get(XIAOMI_INC)
-        if not service_data:
+        if not service_data or len(service_data) < 4:
             return False
 
-        if service_data and len(service_data) >= 4:
-            if service_data[2] + (service_data[3] << 8) == 0x2542 or \
-                service_data[2] + (service_data[3] << 8) == 0x16e4:
-                return True
-        return False
+        # The manifest matcher can only match the service UUID, not the product id
+        return service_data[2] + (service_data[3] << 8) in SUPPORTED_PRODUCT_IDS
+
+    def _async_discover_devices(self) -> dict[str, BluetoothServiceInfoBleak]:
+        """Return the supported devices that aren't configured yet.
+
+        The scan results are cached for the lifetime of the flow.
+        """
+        if self._discovered_devices is None:
+            configured = self._async_current_ids()
+            self._discovered_devices = {
+                device_info.address: device_info
+                for device_info in async_discovered_service_info(self.hass)
+                if self._is_device_supported(device_info)
+                and format_mac(device_info.address) not in configured
+            }
+        return self._discovered_devices
 
     async def _validate_device(self, mijia):
         try:
-            await mijia.connect()
-            await mijia.disconnect()
+            if not await mijia.connect():
+                return "device_validation_error"
+        except NotConnectedError as e:
+            _LOGGER.error(e)
+            return "cannot_connect"
         except Exception as e:
             _LOGGER.error(e)
             return "device_validation_error"
+        finally:
+            await mijia.close()
+
+    async def _async_validate_mac(self, mac: str, fast: bool = False) -> str | None:
+        """Validate a device, returns the error if it isn't usable.
+
+        Fast validation only checks the latest advertisement of the device
+        instead of connecting to it.
+        """
+        if fast:
+            device_info = async_last_service_info(self.hass, mac, connectable=False)
+            if device_info is None or not self._is_device_supported(device_info):
+                return "device_validation_error"
+            return None
+
+        domain_data = await async_load_domain_data(self.hass)
+        # The clock isn't configured yet, keep what validation learns about
+        # it out of the persisted state
+        mijia = Mijia(
+            mac,
+            self.name,
+            resolver=HassDeviceResolver(self.hass),
+            connection_manager=domain_data.connection_manager,
+            device_store=DeviceStateStore()
+        )
+        try:
+            return await self._validate_device(mijia)
+        except Exception as e:
+            return str(e)
+
+    async def async_step_bluetooth(
+        self, discovery_info: BluetoothServiceInfoBleak
+    ) -> ConfigFlowResult:
+        """Handle a device discovered by its advertisements."""
+        if not self._is_device_supported(discovery_info):
+            return self.async_abort(reason="not_supported")
+
+        self.mac = discovery_info.address
+        await self.async_set_unique_id(format_mac(self.mac))
+        self._abort_if_unique_id_configured()
+        self.context["title_placeholders"] = {"name": self.mac}
+        return await self.async_step_bluetooth_confirm()
+
+    async def async_step_bluetooth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Confirm the setup of a discovered device."""
+        if user_input is not None:
+            return await self.async_step_validate()
+
+        self._set_confirm_only()
+        return self.async_show_form(
+            step_id="bluetooth_confirm",
+            description_placeholders={"name": self.mac}
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> ConfigFlowResult:
+        """Create an entry for a device validated by the bulk add step."""
+        # Its discovery flow may still be open, creating the entry aborts it
+        await self.async_set_unique_id(format_mac(import_data[CONF_MAC]), raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=import_data[CONF_NAME], data=import_data)
 
     async def async_step_user(
         self,
@@ -61,18 +193,18 @@ class MijiaTemperatureClockConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             if user_input[CONF_MAC] == MANUAL_MAC:
                 return await self.async_step_manual_mac()
+            if user_input[CONF_MAC] == BULK_ADD:
+                return await self.async_step_bulk_add()
 
             self.mac = user_input[CONF_MAC]
             await self.async_set_unique_id(format_mac(self.mac), raise_on_progress=False)
             self._abort_if_unique_id_configured()
             return await self.async_step_validate()
 
-        discovered_devices = []
-        for device_info in async_discovered_service_info(self.hass):
-            if self._is_device_supported(device_info):
-                discovered_devices.append(device_info)
-
-        device_options = {dev.address: f"{dev.address}" for dev in discovered_devices}
+        discovered_devices = self._async_discover_devices()
+        device_options = {address: address for address in discovered_devices}
+        if len(discovered_devices) > 1:
+            device_options[BULK_ADD] = "Add several clocks at once"
         device_options[MANUAL_MAC] = "Enter MAC address manually"
 
         return self.async_show_form(
@@ -105,19 +237,84 @@ class MijiaTemperatureClockConfigFlow(ConfigFlow, domain=DOMAIN):
             ),
             errors={})
 
+    async def async_step_bulk_add(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Validate and add several discovered devices at once."""
+        discovered_devices = self._async_discover_devices()
+        errors = {}
+        if user_input is not None and user_input[CONF_MACS]:
+            macs = user_input[CONF_MACS]
+            fast = user_input[CONF_FAST_VALIDATION]
+            semaphore = asyncio.Semaphore(BULK_VALIDATION_CONCURRENCY)
+
+            async def _validate(mac: str) -> str | None:
+                async with semaphore:
+                    return await self._async_validate_mac(mac, fast)
+
+            results = await asyncio.gather(*(_validate(mac) for mac in macs))
+            validated = [mac for mac, error in zip(macs, results) if error is None]
+            failed = []
+            for mac, error in zip(macs, results):
+                if error is not None:
+                    _LOGGER.warning(f"Failed to validate {mac}: {error}")
+                    failed.append(mac)
+
+            if validated:
+                first, *others = [
+                    {CONF_MAC: mac, CONF_NAME: f"{self.name} {mac[-5:].replace(':', '')}"}
+                    for mac in validated
+                ]
+                # This flow creates the first entry, the others get their own flow
+                import_results = await asyncio.gather(
+                    *(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": SOURCE_IMPORT},
+                            data=data
+                        )
+                        for data in others
+                    ),
+                    return_exceptions=True
+                )
+                for data, result in zip(others, import_results):
+                    if isinstance(result, Exception):
+                        _LOGGER.warning(f"Failed to add {data[CONF_MAC]}: {result}")
+                        failed.append(data[CONF_MAC])
+                    elif result["type"] != FlowResultType.CREATE_ENTRY:
+                        _LOGGER.warning(f"Failed to add {data[CONF_MAC]}: {result.get('reason')}")
+                        failed.append(data[CONF_MAC])
+
+                await self.async_set_unique_id(format_mac(first[CONF_MAC]), raise_on_progress=False)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=first[CONF_NAME],
+                    data=first,
+                    description="bulk_added",
+                    description_placeholders={
+                        "added": str(len(macs) - len(failed)),
+                        "failed": ", ".join(failed) or "none"
+                    }
+                )
+
+            errors["base"] = "device_validation_error"
+
+        return self.async_show_form(
+            step_id="bulk_add",
+            data_schema=vol.Schema({
+                vol.Required(CONF_MACS, default=list(discovered_devices)): cv.multi_select(
+                    {address: address for address in discovered_devices}
+                ),
+                vol.Required(CONF_FAST_VALIDATION, default=False): bool
+            }),
+            errors=errors
+        )
+
     async def async_step_validate(
         self, user_input: "dict[str, Any] | None" = None
     ) -> ConfigFlowResult:
         """Handle validate step."""
-        error = None
-        mijia = Mijia(self.hass, self.mac, self.name)
-        try:
-            error = await self._validate_device(mijia)
-        except Exception as e:
-            error = str(e)
-        finally:
-            await mijia.disconnect()
-
+        error = await self._async_validate_mac(self.mac)
         if error:
             return await self.async_step_user(errors={"base": error})
 
@@ -149,5 +346,86 @@ class MijiaTemperatureClockConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class MijiaOptionsFlow(OptionsFlow):
+    """Handle options for a Mijia Temperature and Humidity Monitor Clock."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            bindkey = user_input.get(CONF_BINDKEY, "").strip().lower()
+            if bindkey and not _is_valid_bindkey(bindkey):
+                errors[CONF_BINDKEY] = "invalid_bindkey"
+            else:
+                user_input[CONF_BINDKEY] = bindkey
+                return self.async_create_entry(data={**self.config_entry.options, **user_input})
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_BINDKEY,
+                        description={"suggested_value": options.get(CONF_BINDKEY, "")}
+                    ): str,
+                    vol.Required(
+                        CONF_MAX_CONNECTIONS_PER_ADAPTER,
+                        default=options.get(
+                            CONF_MAX_CONNECTIONS_PER_ADAPTER,
+                            DEFAULT_MAX_CONNECTIONS_PER_ADAPTER
+                        )
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                    vol.Required(
+                        CONF_STARTUP_WINDOW,
+                        default=options.get(CONF_STARTUP_WINDOW, DEFAULT_STARTUP_WINDOW)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_WRITE_WITHOUT_RESPONSE,
+                        default=options.get(CONF_WRITE_WITHOUT_RESPONSE, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_IDLE_POLICY,
+                        default=options.get(CONF_IDLE_POLICY, IDLE_POLICY_ADAPTIVE)
+                    ): vol.In({
+                        IDLE_POLICY_ADAPTIVE: "Adaptive",
+                        IDLE_POLICY_FIXED: "Fixed"
+                    }),
+                    vol.Required(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, DISCONNECT_DELAY)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                    vol.Required(
+                        CONF_AUTO_TIME_SYNC,
+                        default=options.get(CONF_AUTO_TIME_SYNC, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_TRANSITION_SYNC,
+                        default=options.get(CONF_TRANSITION_SYNC, True)
+                    ): bool,
+                    vol.Required(
+                        CONF_STREAMING,
+                        default=options.get(CONF_STREAMING, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_STREAM_DURATION,
+                        default=options.get(CONF_STREAM_DURATION, DEFAULT_STREAM_DURATION)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+                    vol.Required(
+                        CONF_STREAM_INTERVAL,
+                        default=options.get(CONF_STREAM_INTERVAL, DEFAULT_STREAM_INTERVAL)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                    vol.Required(
+                        CONF_HISTORY_SYNC,
+                        default=options.get(CONF_HISTORY_SYNC, False)
+                    ): bool
+                }
+            ),
+            errors=errors
+        )
+
+
 class DeviceValidationError(HomeAssistantError):
     """Error to indicate there was a problem with the device."""
\ No newline at end of file
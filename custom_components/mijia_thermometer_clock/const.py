@@ -1,14 +1,64 @@
 """Constants for the Mijia Temperature and Humidity Monitor Clock integration."""
 
+from datetime import timedelta
+
+# The driver constants the integration uses as well
+from .mijia_clock.const import (  # noqa: F401
+    XIAOMI_INC,
+    SUPPORTED_PRODUCT_IDS,
+    DEVICE_CONNECTED,
+    DEVICE_DISCONNECTED,
+    CONFIG_UPDATED,
+    READINGS_UPDATED,
+    STATS_UPDATED,
+    RETRY_INTERVAL,
+    DISCONNECT_DELAY,
+    IDLE_HOLD_MIN
+)
+
 DOMAIN = "mijia_thermometer_clock"
 CONF_TIME = "time"
+CONF_MAX_CONNECTIONS_PER_ADAPTER = "max_connections_per_adapter"
+CONF_BINDKEY = "bindkey"
+CONF_WRITE_WITHOUT_RESPONSE = "write_without_response"
+CONF_AUTO_TIME_SYNC = "auto_time_sync"
+CONF_TRANSITION_SYNC = "transition_sync"
+CONF_STREAMING = "streaming"
+CONF_STREAM_DURATION = "stream_duration"
+CONF_STREAM_INTERVAL = "stream_interval"
+CONF_HISTORY_SYNC = "history_sync"
+CONF_IDLE_POLICY = "idle_policy"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_STARTUP_WINDOW = "startup_window"
+CONF_MACS = "macs"
+CONF_FAST_VALIDATION = "fast_validation"
 
 SERVICE_SET_TIME = "set_time"
+SERVICE_SYNC_TIME = "sync_time"
+SERVICE_SYNC_HISTORY = "sync_history"
+
+# Automatic time sync, in seconds
+DRIFT_TOLERANCE = 15
+DRIFT_SYNC_THRESHOLD = 2
+TIME_SYNC_MIN_INTERVAL = 6 * 3600
+TIME_SYNC_MAX_INTERVAL = 30 * 86400
+TIME_SYNC_DEFAULT_INTERVAL = 86400
+TIME_SYNC_RETRY_INTERVAL = 3600
+# Connect this long before the UTC offset changes
+TRANSITION_PREWARM = 30
+DEFAULT_MAX_CONNECTIONS_PER_ADAPTER = 3
+BULK_VALIDATION_CONCURRENCY = 5
+DEFAULT_STARTUP_WINDOW = 60
+STATE_PUBLISH_WINDOW = 1.0
+
+# Idle-disconnect policies
+IDLE_POLICY_ADAPTIVE = "adaptive"
+IDLE_POLICY_FIXED = "fixed"
 
-DEVICE_CONNECTED = "event.connected"
-DEVICE_DISCONNECTED = "event.disconnected"
-CONFIG_UPDATED = "event.config_updated"
+# Live readings over GATT notifications, in seconds
+DEFAULT_STREAM_DURATION = 60
+DEFAULT_STREAM_INTERVAL = 600
 
-CONNECTION_TIMEOUT = 120
-RETRY_INTERVAL = 10
-DISCONNECT_DELAY = 30
+# On-device history import
+HISTORY_SYNC_INTERVAL = timedelta(hours=6)
+HISTORY_IMPORT_BATCH = 500
@@ -0,0 +1,91 @@
+"""Domain-wide runtime data shared by all Mijia clock config entries."""
+
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    CONF_MAX_CONNECTIONS_PER_ADAPTER,
+    CONF_STARTUP_WINDOW,
+    DEFAULT_MAX_CONNECTIONS_PER_ADAPTER,
+    DEFAULT_STARTUP_WINDOW
+)
+from .mijia_clock.connection_manager import ConnectionManager
+from .publisher import StatePublisher
+from .startup import StartupScheduler
+from .store import MijiaDeviceStore
+from .transitions import TransitionPlanner
+
+if TYPE_CHECKING:
+    from .streaming import StreamingScheduler
+    from .time_sync import TimeSyncScheduler
+
+
+@dataclass
+class MijiaDomainData:
+    device_store: MijiaDeviceStore
+    startup_scheduler: StartupScheduler
+    state_publisher: StatePublisher
+    transition_planner: TransitionPlanner
+    connection_manager: ConnectionManager = field(
+        default_factory=lambda: ConnectionManager(DEFAULT_MAX_CONNECTIONS_PER_ADAPTER)
+    )
+    load_task: asyncio.Task | None = None
+    time_sync_schedulers: dict[str, TimeSyncScheduler] = field(default_factory=dict)
+    streaming_schedulers: dict[str, StreamingScheduler] = field(default_factory=dict)
+    history_sync_unsubs: dict[str, CALLBACK_TYPE] = field(default_factory=dict)
+
+
+@callback
+def async_get_domain_data(hass: HomeAssistant) -> MijiaDomainData:
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = MijiaDomainData(
+            MijiaDeviceStore(hass),
+            StartupScheduler(hass),
+            StatePublisher(hass),
+            TransitionPlanner(hass)
+        )
+    return hass.data[DOMAIN]
+
+
+async def async_load_domain_data(hass: HomeAssistant) -> MijiaDomainData:
+    """Return the domain data, loading the persisted device state once."""
+    domain_data = async_get_domain_data(hass)
+    if domain_data.load_task is None:
+        domain_data.load_task = hass.async_create_task(
+            domain_data.device_store.async_load()
+        )
+    await domain_data.load_task
+    return domain_data
+
+
+@callback
+def async_apply_domain_options(hass: HomeAssistant) -> None:
+    """Apply the options shared by all clocks.
+
+    The adapter connection limit is a property of the radio, not of a single
+    clock, so the lowest value configured on any entry is used. The startup
+    window has to fit the whole fleet, so the highest one is used.
+    """
+    limits = [
+        entry.options[CONF_MAX_CONNECTIONS_PER_ADAPTER]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if CONF_MAX_CONNECTIONS_PER_ADAPTER in entry.options
+    ]
+    domain_data = async_get_domain_data(hass)
+    domain_data.connection_manager.max_connections_per_adapter = min(
+        limits,
+        default=DEFAULT_MAX_CONNECTIONS_PER_ADAPTER
+    )
+    domain_data.startup_scheduler.window = max(
+        (
+            entry.options[CONF_STARTUP_WINDOW]
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if CONF_STARTUP_WINDOW in entry.options
+        ),
+        default=DEFAULT_STARTUP_WINDOW
+    )
@@ -0,0 +1,54 @@
+"""Diagnostics support for the Mijia Temperature and Humidity Monitor Clock."""
+
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_BINDKEY
+from .data import async_get_domain_data
+from .mijia_clock import Mijia
+
+TO_REDACT = {CONF_BINDKEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    instance: Mijia = entry.runtime_data
+    domain_data = async_get_domain_data(hass)
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": async_redact_data(dict(entry.options), TO_REDACT)
+        },
+        "device": {
+            "mac": instance.mac,
+            "is_connected": bool(instance.is_connected),
+            "adapter": instance.adapter_source,
+            "circuit_breaker": {
+                "state": instance.circuit_breaker.state,
+                "failures": instance.circuit_breaker.failures
+            },
+            "use_fahrenheit": instance.use_fahrenheit,
+            "readings": instance.readings,
+            "drift": instance.drift.as_dict(),
+            "idle_policy": instance.idle_policy.as_dict(),
+            "advertisements": instance.deduplicator.as_dict(),
+            "stored_state": instance.device_store.get(instance.mac)
+        },
+        "trace": instance.trace.as_dict(),
+        "session_stats": instance.stats.as_dict(),
+        "eventbus": {
+            **instance.eventbus.counters,
+            "pending_tasks": instance.eventbus.pending_tasks
+        },
+        "adapters": domain_data.connection_manager.diagnostics(),
+        "state_publisher": domain_data.state_publisher.as_dict(),
+        "transitions": domain_data.transition_planner.as_dict()
+    }
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH
 
+from .data import async_get_domain_data
 from .mijia_clock import Mijia
+from .publisher import StatePublisher
 
 @callback
 def async_device_device_info_fn(mijia: Mijia, name: str) -> DeviceInfo:
@@ -12,4 +14,11 @@ def async_device_device_info_fn(mijia: Mijia, name: str) -> DeviceInfo:
         manufacturer="Xiaomi",
         model="LYWSD02MMC",
         name=name
-    )
\ No newline at end of file
+    )
+
+@callback
+def async_get_state_publisher(entity: Entity) -> StatePublisher:
+    """Return the shared state publisher, forgetting the entity once it is removed."""
+    publisher = async_get_domain_data(entity.hass).state_publisher
+    entity.async_on_remove(lambda: publisher.async_forget(entity))
+    return publisher
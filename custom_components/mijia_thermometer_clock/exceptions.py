@@ -1,6 +1 @@
-from homeassistant.exceptions import HomeAssistantError
-
-
-class NotConnectedError(HomeAssistantError):
-    """Error to indicate that the device is not connected."""
-    pass
\ No newline at end of file
+from .mijia_clock.exceptions import MijiaError, NotConnectedError  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""Import of the history kept on Mijia clocks into long-term statistics."""
+
+from __future__ import annotations
+import logging
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_HISTORY_SYNC,
+    HISTORY_IMPORT_BATCH,
+    HISTORY_SYNC_INTERVAL
+)
+from .data import async_get_domain_data
+from .mijia_clock import Mijia
+from .mijia_clock.history import HistoryRecord
+from .mijia_clock.mibeacon import HUMIDITY, TEMPERATURE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statistic key, name, unit and the record fields holding its min and max
+HISTORY_STATISTICS = (
+    (TEMPERATURE, "Temperature", UnitOfTemperature.CELSIUS, "min_temperature", "max_temperature"),
+    (HUMIDITY, "Humidity", PERCENTAGE, "min_humidity", "max_humidity")
+)
+
+
+def get_statistic_id(instance: Mijia, key: str) -> str:
+    return f"{DOMAIN}:{instance.mac.replace(':', '').lower()}_{key}"
+
+
+def _get_statistics(
+    records: list[HistoryRecord],
+    min_field: str,
+    max_field: str
+) -> list[StatisticData]:
+    # One record per hour, the clock only keeps the extremes so the mean is
+    # approximated by their midpoint
+    statistics: dict[int, StatisticData] = {}
+    for record in records:
+        start = record.timestamp - record.timestamp % 3600
+        low = getattr(record, min_field)
+        high = getattr(record, max_field)
+        statistics[start] = StatisticData(
+            start=dt_util.utc_from_timestamp(start),
+            min=low,
+            max=high,
+            mean=(low + high) / 2
+        )
+    return [statistics[start] for start in sorted(statistics)]
+
+
+async def async_import_history(hass: HomeAssistant, instance: Mijia) -> int:
+    """Download the history records added since the last import and import them.
+
+    Returns the number of imported records. The cursor only moves forward
+    once the records were handed to the recorder.
+    """
+    records = sorted(await instance.download_history(), key=lambda record: record.index)
+    if not records:
+        return 0
+
+    for key, name, unit, min_field, max_field in HISTORY_STATISTICS:
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{instance.name} {name}",
+            source=DOMAIN,
+            statistic_id=get_statistic_id(instance, key),
+            unit_of_measurement=unit
+        )
+        statistics = _get_statistics(records, min_field, max_field)
+        for start in range(0, len(statistics), HISTORY_IMPORT_BATCH):
+            async_add_external_statistics(
+                hass,
+                metadata,
+                statistics[start:start + HISTORY_IMPORT_BATCH]
+            )
+
+    instance.set_history_cursor(records[-1].index + 1)
+    _LOGGER.debug(f"Imported {len(records)} history records from {instance.mac}")
+    return len(records)
+
+
+@callback
+def async_update_history_sync(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Start or stop the periodic history import of an entry according to its options."""
+    unsubs = async_get_domain_data(hass).history_sync_unsubs
+    enabled = entry.options.get(CONF_HISTORY_SYNC, False)
+
+    if enabled and entry.entry_id not in unsubs:
+        instance: Mijia = entry.runtime_data
+
+        async def _async_import(_now=None) -> None:
+            try:
+                await async_import_history(hass, instance)
+            except Exception as e:
+                _LOGGER.debug(f"History import from {instance.mac} failed: {e}")
+
+        unsubs[entry.entry_id] = async_track_time_interval(
+            hass,
+            _async_import,
+            HISTORY_SYNC_INTERVAL
+        )
+        # Catch up on what was missed while we were away
+        hass.async_create_background_task(
+            _async_import(),
+            f"{DOMAIN} history import {instance.mac}"
+        )
+    elif not enabled and entry.entry_id in unsubs:
+        async_stop_history_sync(hass, entry)
+
+
+@callback
+def async_stop_history_sync(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    unsub = async_get_domain_data(hass).history_sync_unsubs.pop(entry.entry_id, None)
+    if unsub is not None:
+        unsub()
@@ -1,3 +1,4 @@
+from .exceptions import MijiaError, NotConnectedError
 from .mijia import Mijia
 
-__all__ = ["Mijia"]
\ No newline at end of file
+__all__ = ["Mijia", "MijiaError", "NotConnectedError"]
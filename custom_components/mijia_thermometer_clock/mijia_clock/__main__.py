@@ -0,0 +1,167 @@
+"""Provision and time-sync LYWSD02MMC clocks from a plain Linux host.
+
+Run from the directory containing the `mijia_clock` package:
+
+    python -m mijia_clock scan
+    python -m mijia_clock sync-time --all
+    python -m mijia_clock provision --unit celsius AA:BB:CC:DD:EE:FF
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+
+from .bulk import run_on
+from .connection_manager import ConnectionManager
+from .const import SUPPORTED_PRODUCT_IDS, XIAOMI_INC
+from .mijia import Mijia
+from .resolver import BleakScannerResolver
+
+
+def _local_timezone_offset() -> float:
+    return time.localtime().tm_gmtoff / 3600
+
+
+def _get_product_id(service_data: bytes) -> int | None:
+    if len(service_data) < 4:
+        return None
+    return service_data[2] | (service_data[3] << 8)
+
+
+async def find_clocks(resolver: BleakScannerResolver, timeout: float) -> dict[str, int | None]:
+    """Scan for supported clocks, returns their RSSI by address."""
+    discovered = await resolver.scan(timeout)
+    return {
+        address: advertisement.rssi
+        for address, (device, advertisement) in sorted(discovered.items())
+        if _get_product_id(advertisement.service_data.get(XIAOMI_INC, b"")) in SUPPORTED_PRODUCT_IDS
+    }
+
+
+async def _get_instances(args, resolver: BleakScannerResolver) -> list[Mijia]:
+    macs = [mac.upper() for mac in args.macs]
+    if args.all:
+        macs = sorted(set(macs) | set(await find_clocks(resolver, args.scan_timeout)))
+    elif macs:
+        # One scan resolves the whole fleet instead of a lookup per clock
+        await resolver.scan(args.scan_timeout)
+
+    connection_manager = ConnectionManager(args.max_connections)
+    instances = [
+        Mijia(mac, mac, resolver=resolver, connection_manager=connection_manager)
+        for mac in macs
+    ]
+    args.instances = instances
+    return instances
+
+
+async def scan(args, resolver: BleakScannerResolver) -> list[dict]:
+    clocks = await find_clocks(resolver, args.scan_timeout)
+    return [{"mac": mac, "rssi": rssi} for mac, rssi in clocks.items()]
+
+
+async def sync_time(args, resolver: BleakScannerResolver) -> list[dict]:
+    instances = await _get_instances(args, resolver)
+    timezone_offset = args.timezone_offset
+    if timezone_offset is None:
+        timezone_offset = _local_timezone_offset()
+    return await run_on(
+        instances,
+        lambda instance: instance.set_time(int(time.time()), timezone_offset)
+    )
+
+
+async def provision(args, resolver: BleakScannerResolver) -> list[dict]:
+    instances = await _get_instances(args, resolver)
+    timezone_offset = args.timezone_offset
+    if timezone_offset is None:
+        timezone_offset = _local_timezone_offset()
+
+    async def _provision(instance: Mijia):
+        # Queued together, both writes share one connection
+        await asyncio.gather(
+            instance.set_time(int(time.time()), timezone_offset),
+            instance.set_use_fahrenheit(args.unit == "fahrenheit")
+        )
+
+    return await run_on(instances, _provision)
+
+
+COMMANDS = {
+    "scan": scan,
+    "sync-time": sync_time,
+    "provision": provision
+}
+
+
+def _print_results(command: str, results: list[dict]) -> None:
+    if command == "scan":
+        for result in results:
+            print(f"{result['mac']}  {result['rssi']} dBm")
+        print(f"{len(results)} clock(s) found")
+        return
+
+    for result in results:
+        status = "ok" if result["success"] else f"failed: {result['error']}"
+        print(f"{result['mac']}  {result['latency']:.2f}s  {status}")
+    succeeded = sum(1 for result in results if result["success"])
+    print(f"{succeeded}/{len(results)} clock(s) updated")
+
+
+async def _run_command(args, resolver: BleakScannerResolver) -> list[dict]:
+    try:
+        return await COMMANDS[args.command](args, resolver)
+    finally:
+        for instance in getattr(args, "instances", []):
+            await instance.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m mijia_clock", description=__doc__.splitlines()[0])
+    parser.add_argument("--adapter", help="Bluetooth adapter to use, e.g. hci0")
+    parser.add_argument("--scan-timeout", type=float, default=10.0, help="Seconds to scan for clocks")
+    parser.add_argument("--max-connections", type=int, default=3, help="Simultaneous connections per adapter")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--trace", metavar="PATH", help="Append the BLE trace of each clock to PATH as JSON lines")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log debug messages")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("scan", help="List the clocks in range")
+    for name, help_text in (
+        ("sync-time", "Set the time on clocks"),
+        ("provision", "Set the time and temperature unit on clocks")
+    ):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("macs", nargs="*", metavar="MAC", help="Addresses of the clocks")
+        subparser.add_argument("--all", action="store_true", help="Include every clock in range")
+        subparser.add_argument(
+            "--timezone-offset",
+            type=float,
+            help="Offset from UTC in hours, e.g. 5.5, defaults to the offset of this host"
+        )
+        if name == "provision":
+            subparser.add_argument("--unit", choices=("celsius", "fahrenheit"), required=True)
+
+    args = parser.parse_args(argv)
+    if args.command != "scan" and not args.macs and not args.all:
+        parser.error("pass the addresses of the clocks or --all")
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    resolver = BleakScannerResolver(args.adapter, args.scan_timeout)
+    results = asyncio.run(_run_command(args, resolver))
+    if args.trace:
+        for instance in getattr(args, "instances", []):
+            instance.trace.export(args.trace, mac=instance.mac)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_results(args.command, results)
+    return 0 if all(result.get("success", True) for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Run commands on many clocks at once."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from .mijia import Mijia
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def run_on(
+    instances: list[Mijia],
+    action: Callable[[Mijia], Awaitable[Any]]
+) -> list[dict[str, Any]]:
+    """Run `action` on all clocks concurrently and report the outcome for each."""
+    async def _run(instance: Mijia) -> dict[str, Any]:
+        result = {
+            "name": instance.name,
+            "mac": instance.mac,
+            "success": False,
+            "latency": None,
+            "error": None
+        }
+        start_time = time.monotonic()
+        try:
+            await action(instance)
+            result["success"] = True
+        except Exception as e:
+            _LOGGER.debug(f"Command failed on {instance.mac}: {e}")
+            result["error"] = str(e) or type(e).__name__
+        finally:
+            result["latency"] = round(time.monotonic() - start_time, 3)
+        return result
+
+    # Per-adapter connection slots cap the concurrency. Connections are left
+    # to the idle disconnect, which gives slots up as soon as others wait
+    # for them, so streams and queued commands of the clocks survive.
+    return list(await asyncio.gather(*(_run(instance) for instance in instances)))
+
+
+async def sync_time_on(
+    instances: list[Mijia],
+    timestamp: int,
+    timezone_offset: float | None
+) -> list[dict[str, Any]]:
+    """Set the time on all clocks concurrently."""
+    return await run_on(
+        instances,
+        lambda instance: instance.set_time(timestamp, timezone_offset)
+    )
@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Command:
+    run: Callable[[], Awaitable[Any]]
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+class CommandQueue:
+    """Run the commands submitted for a device in as few connection sessions as possible.
+
+    Commands submitted within `batch_window` seconds of each other, or while a
+    session is already running, share the same connection. Commands with the
+    same key are coalesced: the latest one replaces the pending one, keeping
+    its place in the queue, and every submitter receives its result.
+    """
+
+    def __init__(
+        self,
+        open_session: Callable[[], Awaitable[None]],
+        close_session: Callable[[], Awaitable[None]],
+        batch_window: float = 0.0
+    ):
+        self._open_session = open_session
+        self._close_session = close_session
+        self._batch_window = batch_window
+        self._pending: dict[Any, Command] = {}
+        self._worker: asyncio.Task | None = None
+        self._ids = itertools.count()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(
+        self,
+        run: Callable[[], Awaitable[Any]],
+        key: str | None = None
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if key is None:
+            key = next(self._ids)
+        command = self._pending.get(key)
+        if command is None:
+            command = self._pending[key] = Command(run)
+        else:
+            command.run = run
+        command.futures.append(future)
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return future
+
+    def cancel(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for command in self._pending.values():
+            for future in command.futures:
+                future.cancel()
+        self._pending.clear()
+
+    async def _run(self):
+        if self._batch_window:
+            await asyncio.sleep(self._batch_window)
+
+        while self._pending:
+            batch = list(self._pending.values())
+            self._pending.clear()
+            try:
+                await self._run_batch(batch)
+            except asyncio.CancelledError:
+                # The batch was taken off the queue, cancel() can't reach it
+                for command in batch:
+                    for future in command.futures:
+                        future.cancel()
+                raise
+
+        try:
+            await self._close_session()
+        except Exception as e:
+            _LOGGER.debug("Failed to close session: %s", e)
+
+    async def _run_batch(self, batch: list[Command]):
+        try:
+            await self._open_session()
+        except Exception as e:
+            for command in batch:
+                self._set_exception(command, e)
+            return
+
+        _LOGGER.debug("Running %s command(s) in one session", len(batch))
+        for command in batch:
+            try:
+                result = await command.run()
+            except Exception as e:
+                self._set_exception(command, e)
+            else:
+                for future in command.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+    def _set_exception(self, command: Command, exception: Exception):
+        for future in command.futures:
+            if not future.done():
+                future.set_exception(exception)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS_PER_ADAPTER = 3
+
+
+class AdapterSlots:
+    """Connection slots of a single Bluetooth adapter or proxy."""
+
+    def __init__(self, source: str, limit: int):
+        self.source = source
+        self.limit = limit
+        self.holders: set[str] = set()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._idle_holders: deque[asyncio.Future] = deque()
+
+    @property
+    def free(self) -> int:
+        return max(self.limit - len(self.holders), 0)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def try_acquire(self, mac: str) -> bool:
+        if mac in self.holders:
+            return True
+        if len(self.holders) >= self.limit:
+            return False
+        self.holders.add(mac)
+        return True
+
+    async def acquire(self, mac: str) -> None:
+        while not self.try_acquire(mac):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._wake_idle_holder()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # We were woken up but won't take the slot, pass it on
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_next()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    async def wait_for_pressure(self) -> None:
+        """Wait until a device queues for a slot of this adapter.
+
+        Each queued device wakes a single idle holder, the one that has
+        been waiting the longest.
+        """
+        if self.waiting:
+            return
+
+        idle_holder = asyncio.get_running_loop().create_future()
+        self._idle_holders.append(idle_holder)
+        try:
+            await idle_holder
+        finally:
+            if idle_holder in self._idle_holders:
+                self._idle_holders.remove(idle_holder)
+
+    def release(self, mac: str) -> None:
+        if mac not in self.holders:
+            return
+        self.holders.discard(mac)
+        self._wake_next()
+
+    def _wake_idle_holder(self) -> None:
+        while self._idle_holders:
+            idle_holder = self._idle_holders.popleft()
+            if not idle_holder.done():
+                idle_holder.set_result(None)
+                return
+
+    def _wake_next(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+
+class ConnectionManager:
+    """Limit the number of concurrent connections per Bluetooth adapter.
+
+    A slot is taken before connecting and held for as long as the device
+    stays connected, so a slow or unreachable clock only ever occupies its
+    own slot instead of blocking every other device.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_adapter: int = DEFAULT_MAX_CONNECTIONS_PER_ADAPTER
+    ):
+        self._max_connections_per_adapter = max_connections_per_adapter
+        self._adapters: dict[str, AdapterSlots] = {}
+
+    @property
+    def max_connections_per_adapter(self) -> int:
+        return self._max_connections_per_adapter
+
+    @max_connections_per_adapter.setter
+    def max_connections_per_adapter(self, limit: int) -> None:
+        self._max_connections_per_adapter = limit
+        for slots in self._adapters.values():
+            slots.limit = limit
+            # A raised limit may let queued devices through
+            for _ in range(slots.free):
+                slots._wake_next()
+
+    def adapter(self, source: str) -> AdapterSlots:
+        slots = self._adapters.get(source)
+        if slots is None:
+            slots = AdapterSlots(source, self._max_connections_per_adapter)
+            self._adapters[source] = slots
+        return slots
+
+    async def acquire(self, source: str, mac: str) -> None:
+        slots = self.adapter(source)
+        if not slots.try_acquire(mac):
+            _LOGGER.debug(f"All connection slots of {source} are busy, {mac} is waiting")
+            await slots.acquire(mac)
+
+    def release(self, source: str, mac: str) -> None:
+        slots = self._adapters.get(source)
+        if slots is not None:
+            slots.release(mac)
+
+    def diagnostics(self) -> dict:
+        return {
+            source: {
+                "limit": slots.limit,
+                "in_use": sorted(slots.holders),
+                "waiting": slots.waiting
+            }
+            for source, slots in self._adapters.items()
+        }
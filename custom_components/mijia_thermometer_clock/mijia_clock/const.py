@@ -0,0 +1,24 @@
+"""Constants of the Mijia clock driver."""
+
+XIAOMI_INC = "0000fe95-0000-1000-8000-00805f9b34fb"
+# MiBeacon product ids of the LYWSD02MMC
+SUPPORTED_PRODUCT_IDS = (0x2542, 0x16E4)
+
+DEVICE_CONNECTED = "event.connected"
+DEVICE_DISCONNECTED = "event.disconnected"
+CONFIG_UPDATED = "event.config_updated"
+READINGS_UPDATED = "event.readings_updated"
+STATS_UPDATED = "event.stats_updated"
+
+CONNECTION_TIMEOUT = 120
+RETRY_INTERVAL = 10
+RETRY_BACKOFF_INITIAL = 1
+RETRY_BACKOFF_MAX = 30
+CONNECT_BACKOFF_MAX = 600
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_RESET_TIMEOUT = 600
+DISCONNECT_DELAY = 30
+IDLE_HOLD_MIN = 2
+COMMAND_BATCH_WINDOW = 0.1
+HISTORY_RECORD_TIMEOUT = 5
+SLOT_WAIT_TIMEOUT = 60
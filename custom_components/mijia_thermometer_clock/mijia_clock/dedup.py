@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# MiBeacon frames are repeated for a few seconds, and the one byte frame
+# counter wraps around after 256 frames
+DEDUP_WINDOW = 10.0
+DEDUP_MAX_ENTRIES = 32
+
+
+@dataclass
+class AdvertisementCopy:
+    seen_at: float
+    rssi: int | None
+    source: str | None
+
+
+class AdvertisementDeduplicator:
+    """Drop the copies of an advertisement relayed by several scanners.
+
+    Every adapter and proxy in range reports the same MiBeacon frame. A frame
+    is identified by its service data, which includes the frame counter, and
+    only the first copy seen within `window` seconds is let through. The
+    copy with the best RSSI is remembered.
+    """
+
+    def __init__(self, window: float = DEDUP_WINDOW, max_entries: int = DEDUP_MAX_ENTRIES):
+        self.window = window
+        self.max_entries = max_entries
+        self.counters = {"accepted": 0, "dropped": 0}
+        self._seen: OrderedDict[bytes, AdvertisementCopy] = OrderedDict()
+        self.best: AdvertisementCopy | None = None
+
+    def is_duplicate(
+        self,
+        service_data: bytes,
+        rssi: int | None = None,
+        source: str | None = None,
+        now: float | None = None
+    ) -> bool:
+        if now is None:
+            now = time.monotonic()
+        self._expire(now)
+
+        key = bytes(service_data)
+        copy = self._seen.get(key)
+        if copy is not None:
+            self.counters["dropped"] += 1
+            if rssi is not None and (copy.rssi is None or rssi > copy.rssi):
+                copy.rssi = rssi
+                copy.source = source
+            return True
+
+        copy = self._seen[key] = AdvertisementCopy(now, rssi, source)
+        self.best = copy
+        self.counters["accepted"] += 1
+        return False
+
+    def as_dict(self) -> dict:
+        return {
+            **self.counters,
+            "tracked": len(self._seen),
+            "best_source": self.best.source if self.best else None,
+            "best_rssi": self.best.rssi if self.best else None
+        }
+
+    def _expire(self, now: float) -> None:
+        # Entries are ordered by the time they were first seen
+        while self._seen:
+            key, copy = next(iter(self._seen.items()))
+            if now - copy.seen_at <= self.window and len(self._seen) < self.max_entries:
+                break
+            del self._seen[key]
@@ -0,0 +1,29 @@
+from typing import Any
+
+
+class DeviceStateStore:
+    """Last known state of each device, keyed by MAC address.
+
+    This implementation only keeps the state in memory; subclasses persist it
+    by overriding `_changed`.
+    """
+
+    def __init__(self, data: dict[str, dict[str, Any]] | None = None):
+        self._data: dict[str, dict[str, Any]] = data or {}
+
+    def get(self, mac: str) -> dict[str, Any]:
+        return self._data.get(mac.upper(), {})
+
+    def update(self, mac: str, **values: Any) -> None:
+        state = self._data.setdefault(mac.upper(), {})
+        changed = {key: value for key, value in values.items() if state.get(key) != value}
+        if changed:
+            state.update(changed)
+            self._changed()
+
+    def remove(self, mac: str) -> None:
+        if self._data.pop(mac.upper(), None) is not None:
+            self._changed()
+
+    def _changed(self) -> None:
+        pass
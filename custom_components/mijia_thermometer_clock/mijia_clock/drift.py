@@ -0,0 +1,58 @@
+from dataclasses import asdict, dataclass
+
+# Measurements closer than this to the last sync are dominated by the
+# one second resolution of the clock
+MIN_MEASUREMENT_SPAN = 3600
+SMOOTHING = 0.5
+
+
+@dataclass
+class DriftEstimator:
+    """Estimate how fast a clock drifts away from the real time.
+
+    `drift_rate` is the number of seconds the clock gains (or loses, when
+    negative) per second of real time.
+    """
+
+    last_sync_at: float | None = None
+    last_check_at: float | None = None
+    last_drift: float | None = None
+    drift_rate: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriftEstimator":
+        return cls(**{key: data.get(key) for key in cls.__dataclass_fields__})
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def record_sync(self, now: float) -> None:
+        self.last_sync_at = now
+        self.last_drift = 0.0
+
+    def record_measurement(self, now: float, drift: float) -> None:
+        self.last_check_at = now
+        self.last_drift = drift
+        if self.last_sync_at is None or now - self.last_sync_at < MIN_MEASUREMENT_SPAN:
+            return
+
+        rate = drift / (now - self.last_sync_at)
+        if self.drift_rate is None:
+            self.drift_rate = rate
+        else:
+            self.drift_rate = SMOOTHING * rate + (1 - SMOOTHING) * self.drift_rate
+
+    def next_check_interval(
+        self,
+        tolerance: float,
+        min_interval: float,
+        max_interval: float,
+        default_interval: float
+    ) -> float:
+        """Time until the clock is expected to drift by `tolerance` seconds."""
+        if not self.drift_rate:
+            return default_interval
+
+        remaining = tolerance - abs(self.last_drift or 0.0)
+        interval = max(remaining, 0.0) / abs(self.drift_rate)
+        return min(max(interval, min_interval), max_interval)
@@ -1,21 +1,103 @@
 import asyncio
+import inspect
+import logging
+import weakref
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _listener_key(listener):
+  if inspect.ismethod(listener):
+    return (id(listener.__self__), listener.__func__)
+  return listener
+
 
 class EventBus:
+  """Dispatch device events to their listeners.
+
+  Plain functions are called directly, coroutine functions run in tasks that
+  the bus keeps track of until they finish. Bound methods are only weakly
+  referenced, so subscribing doesn't keep the subscriber alive.
+  """
+
   def __init__(self):
     self.listeners = {}
+    self.counters = {"dispatched": 0, "calls": 0, "tasks": 0, "errors": 0}
+    self._tasks = set()
+
+  @property
+  def pending_tasks(self):
+    return len(self._tasks)
 
   def add_listener(self, event_name, listener):
-    if not self.listeners.get(event_name, None):
-      self.listeners[event_name] = {listener}
+    """Subscribe to an event, returns a function that unsubscribes."""
+    key = _listener_key(listener)
+    if inspect.ismethod(listener):
+      ref = weakref.WeakMethod(
+        listener,
+        lambda _: self._discard(event_name, key)
+      )
     else:
-      self.listeners[event_name].add(listener)
+      ref = lambda: listener
+
+    self.listeners.setdefault(event_name, {})[key] = (
+      ref,
+      asyncio.iscoroutinefunction(listener)
+    )
+    return lambda: self._discard(event_name, key)
 
   def remove_listener(self, event_name, listener):
-    self.listeners[event_name].remove(listener)
-    if len(self.listeners[event_name]) == 0:
-      del self.listeners[event_name]
+    self._discard(event_name, _listener_key(listener))
 
   def send(self, event_name, event_data=None):
-    listeners = self.listeners.get(event_name, [])
-    for listener in listeners:
-      asyncio.create_task(listener(event_data))
\ No newline at end of file
+    listeners = self.listeners.get(event_name)
+    if not listeners:
+      return
+
+    self.counters["dispatched"] += 1
+    for ref, is_coroutine in list(listeners.values()):
+      listener = ref()
+      if listener is None:
+        continue
+
+      if is_coroutine:
+        self._create_task(listener(event_data))
+        continue
+
+      self.counters["calls"] += 1
+      try:
+        listener(event_data)
+      except Exception:
+        self.counters["errors"] += 1
+        _LOGGER.exception(f"Error in {event_name} listener {listener}")
+
+  def cancel_tasks(self):
+    for task in list(self._tasks):
+      task.cancel()
+
+  def clear(self):
+    self.listeners.clear()
+    self.cancel_tasks()
+
+  def _discard(self, event_name, key):
+    listeners = self.listeners.get(event_name)
+    if listeners is None:
+      return
+    listeners.pop(key, None)
+    if len(listeners) == 0:
+      del self.listeners[event_name]
+
+  def _create_task(self, coro):
+    task = asyncio.get_running_loop().create_task(coro)
+    self.counters["tasks"] += 1
+    self._tasks.add(task)
+    task.add_done_callback(self._task_done)
+
+  def _task_done(self, task):
+    self._tasks.discard(task)
+    if task.cancelled():
+      return
+    exception = task.exception()
+    if exception is not None:
+      self.counters["errors"] += 1
+      _LOGGER.error("Error in event listener", exc_info=exception)
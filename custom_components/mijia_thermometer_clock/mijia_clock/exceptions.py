@@ -0,0 +1,8 @@
+class MijiaError(Exception):
+    """Base class of the errors raised by the Mijia clock driver."""
+    pass
+
+
+class NotConnectedError(MijiaError):
+    """Error to indicate that the device is not connected."""
+    pass
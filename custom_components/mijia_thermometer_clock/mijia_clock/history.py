@@ -0,0 +1,48 @@
+"""Hourly min/max history records kept on the LYWSD02MMC."""
+
+from dataclasses import dataclass
+from struct import calcsize, unpack_from
+
+# Index, timestamp, max temperature, max humidity, min temperature, min humidity
+RECORD_FORMAT = "<IIhBhB"
+RECORD_SIZE = calcsize(RECORD_FORMAT)
+
+
+class HistoryError(Exception):
+    """Error raised for history data that can't be parsed."""
+    pass
+
+
+@dataclass(frozen=True)
+class HistoryRecord:
+    index: int
+    timestamp: int
+    max_temperature: float
+    max_humidity: int
+    min_temperature: float
+    min_humidity: int
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HistoryRecord":
+        if len(data) < RECORD_SIZE:
+            raise HistoryError(f"History record too short: {bytes(data).hex()}")
+
+        index, timestamp, max_temperature, max_humidity, min_temperature, min_humidity = (
+            unpack_from(RECORD_FORMAT, data)
+        )
+        return cls(
+            index,
+            timestamp,
+            max_temperature / 100,
+            max_humidity,
+            min_temperature / 100,
+            min_humidity
+        )
+
+
+def parse_record_count(data: bytes) -> tuple[int, int]:
+    """Return the number of stored records and the index of the latest one."""
+    if len(data) < 8:
+        raise HistoryError(f"Record count too short: {bytes(data).hex()}")
+    count, last_index = unpack_from("<II", data)
+    return count, last_index
@@ -0,0 +1,72 @@
+"""Policies deciding how long an idle connection is kept open."""
+
+# Hold the link a bit longer than the typical gap between two commands
+HEADROOM = 1.5
+SMOOTHING = 0.3
+# Commands closer together than this end up in the same session anyway
+MIN_GAP = 1.0
+
+
+class IdlePolicy:
+    """Base class of the idle-disconnect policies."""
+
+    def record_command(self, now: float) -> None:
+        pass
+
+    def hold_time(self) -> float:
+        raise NotImplementedError
+
+    def as_dict(self) -> dict:
+        return {}
+
+
+class FixedIdle(IdlePolicy):
+    """Always keep the connection open for the same time."""
+
+    def __init__(self, hold_time: float):
+        self._hold_time = hold_time
+
+    def hold_time(self) -> float:
+        return self._hold_time
+
+    def as_dict(self) -> dict:
+        return {"policy": "fixed", "hold_time": self._hold_time}
+
+
+class AdaptiveIdle(IdlePolicy):
+    """Learn how often a device gets commands and hold the link accordingly.
+
+    The gap between commands is smoothed with an exponentially weighted
+    moving average. When the next command is expected within `maximum`
+    seconds, the connection is held until then. Otherwise reconnecting is
+    cheaper than holding a slot, and the link is only held for `minimum`.
+    """
+
+    def __init__(self, minimum: float, maximum: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean_gap: float | None = None
+        self._last_command_at: float | None = None
+
+    def record_command(self, now: float) -> None:
+        if self._last_command_at is not None:
+            gap = now - self._last_command_at
+            if gap < MIN_GAP:
+                return
+            if self.mean_gap is None:
+                self.mean_gap = gap
+            else:
+                self.mean_gap += SMOOTHING * (gap - self.mean_gap)
+        self._last_command_at = now
+
+    def hold_time(self) -> float:
+        if self.mean_gap is None or self.mean_gap * HEADROOM > self.maximum:
+            return self.minimum
+        return max(self.mean_gap * HEADROOM, self.minimum)
+
+    def as_dict(self) -> dict:
+        return {
+            "policy": "adaptive",
+            "mean_gap": self.mean_gap,
+            "hold_time": self.hold_time()
+        }
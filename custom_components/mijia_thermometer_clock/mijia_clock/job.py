@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CoalescingJob:
+    """Run an async job with at most one pending run at a time.
+
+    Requests made while the job is running, or while it is backing off after
+    a failure, are dropped. Each consecutive failure doubles the backoff, up
+    to `max_backoff` seconds.
+    """
+
+    def __init__(
+        self,
+        job: Callable[[], Awaitable[bool]],
+        min_backoff: float,
+        max_backoff: float
+    ):
+        self._job = job
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._task: asyncio.Task | None = None
+        self._failures = 0
+        self._not_before = 0.0
+
+    @property
+    def pending(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def schedule(self) -> bool:
+        if self.pending or time.monotonic() < self._not_before:
+            return False
+
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    def reset_backoff(self) -> None:
+        self._failures = 0
+        self._not_before = 0.0
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        try:
+            success = await self._job()
+        except Exception as e:
+            _LOGGER.debug(f"Scheduled job failed: {e}")
+            success = False
+
+        if success:
+            self.reset_backoff()
+            return
+
+        backoff = min(self._min_backoff * 2 ** self._failures, self._max_backoff)
+        self._failures += 1
+        self._not_before = time.monotonic() + backoff
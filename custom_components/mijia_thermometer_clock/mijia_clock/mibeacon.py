@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field
+from struct import unpack_from
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+
+TEMPERATURE = "temperature"
+HUMIDITY = "humidity"
+BATTERY = "battery"
+
+FRAME_CONTROL_ENCRYPTED = 0x08
+FRAME_CONTROL_MAC_INCLUDED = 0x10
+FRAME_CONTROL_CAPABILITY_INCLUDED = 0x20
+FRAME_CONTROL_OBJECT_INCLUDED = 0x40
+CAPABILITY_IO = 0x20
+
+# Nonce tail (3 bytes) and message integrity check (4 bytes) of v4/v5 frames
+ENCRYPTION_TRAILER_LENGTH = 7
+MIC_LENGTH = 4
+ASSOCIATED_DATA = b"\x11"
+
+
+class MiBeaconError(Exception):
+    """Error to indicate that a MiBeacon frame could not be decoded."""
+    pass
+
+
+@dataclass
+class MiBeaconFrame:
+    product_id: int
+    frame_counter: int
+    encrypted: bool
+    readings: dict[str, float | int] = field(default_factory=dict)
+
+
+def _parse_objects(payload: bytes) -> dict[str, float | int]:
+    readings = {}
+    i = 0
+    while len(payload) - i >= 3:
+        object_id = payload[i] | (payload[i + 1] << 8)
+        length = payload[i + 2]
+        value = payload[i + 3:i + 3 + length]
+        i += 3 + length
+        if len(value) != length:
+            break
+
+        if object_id == 0x1004 and length == 2:
+            readings[TEMPERATURE] = unpack_from("<h", value)[0] / 10
+        elif object_id == 0x1006 and length == 2:
+            readings[HUMIDITY] = unpack_from("<H", value)[0] / 10
+        elif object_id == 0x100A and length >= 1:
+            readings[BATTERY] = value[0]
+        elif object_id == 0x100D and length == 4:
+            temperature, humidity = unpack_from("<hH", value)
+            readings[TEMPERATURE] = temperature / 10
+            readings[HUMIDITY] = humidity / 10
+        elif object_id == 0x4C01 and length == 4:
+            readings[TEMPERATURE] = round(unpack_from("<f", value)[0], 1)
+        elif object_id == 0x4C02 and length == 1:
+            readings[HUMIDITY] = value[0]
+        elif object_id == 0x4803 and length == 1:
+            readings[BATTERY] = value[0]
+    return readings
+
+
+class MiBeaconDecoder:
+    """Decode the Xiaomi (FE95) service data advertised by a single device.
+
+    The AES-CCM context is built once per bindkey and reused for every
+    encrypted frame of the device.
+    """
+
+    def __init__(self, mac: str, bindkey: bytes | None = None):
+        self._mac_reversed = bytes.fromhex(mac.replace(":", ""))[::-1]
+        self._cipher: AESCCM | None = None
+        self.set_bindkey(bindkey)
+
+    def set_bindkey(self, bindkey: bytes | None) -> None:
+        self._cipher = AESCCM(bindkey, tag_length=MIC_LENGTH) if bindkey else None
+
+    def decode(self, data: bytes) -> MiBeaconFrame:
+        if len(data) < 5:
+            raise MiBeaconError("Frame too short")
+
+        frame_control = data[0] | (data[1] << 8)
+        version = frame_control >> 12
+        product_id = data[2] | (data[3] << 8)
+        frame_counter = data[4]
+        encrypted = bool(frame_control & FRAME_CONTROL_ENCRYPTED)
+
+        i = 5
+        mac_reversed = self._mac_reversed
+        if frame_control & FRAME_CONTROL_MAC_INCLUDED:
+            mac_reversed = data[i:i + 6]
+            i += 6
+        if frame_control & FRAME_CONTROL_CAPABILITY_INCLUDED:
+            if len(data) <= i:
+                raise MiBeaconError("Frame too short")
+            capability = data[i]
+            i += 1
+            if capability & CAPABILITY_IO:
+                i += 1
+        if len(data) < i:
+            raise MiBeaconError("Frame too short")
+
+        frame = MiBeaconFrame(product_id, frame_counter, encrypted)
+        if not frame_control & FRAME_CONTROL_OBJECT_INCLUDED:
+            return frame
+
+        payload = data[i:]
+        if encrypted:
+            payload = self._decrypt(data, i, version, mac_reversed)
+        frame.readings = _parse_objects(payload)
+        return frame
+
+    def _decrypt(
+        self,
+        data: bytes,
+        payload_start: int,
+        version: int,
+        mac_reversed: bytes
+    ) -> bytes:
+        if version < 4:
+            raise MiBeaconError(f"Unsupported encrypted MiBeacon version {version}")
+        if self._cipher is None:
+            raise MiBeaconError("Encrypted frame received but no bindkey is configured")
+        if len(data) < payload_start + ENCRYPTION_TRAILER_LENGTH:
+            raise MiBeaconError("Encrypted frame too short")
+
+        nonce = mac_reversed + data[2:5] + data[-ENCRYPTION_TRAILER_LENGTH:-MIC_LENGTH]
+        ciphertext = data[payload_start:-ENCRYPTION_TRAILER_LENGTH] + data[-MIC_LENGTH:]
+        try:
+            return self._cipher.decrypt(nonce, ciphertext, ASSOCIATED_DATA)
+        except InvalidTag as e:
+            raise MiBeaconError("Decryption failed, check the bindkey") from e
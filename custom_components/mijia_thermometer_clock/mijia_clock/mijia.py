@@ -1,182 +1,723 @@
 import asyncio
+import dataclasses
 import logging
 import time
-from struct import pack
+from struct import pack, unpack_from
 from bleak import BleakClient
+from bleak.backends.characteristic import BleakGATTCharacteristic
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 
-from homeassistant.core import HomeAssistant
-from homeassistant.components.bluetooth import (
-    async_ble_device_from_address
-)
-
-from .eventbus import EventBus
-from ..const import (
+from .command_queue import CommandQueue
+from .connection_manager import ConnectionManager
+from .dedup import AdvertisementDeduplicator
+from .const import (
     CONFIG_UPDATED,
+    READINGS_UPDATED,
+    STATS_UPDATED,
     DEVICE_CONNECTED,
     DEVICE_DISCONNECTED,
     CONNECTION_TIMEOUT,
     RETRY_INTERVAL,
-    DISCONNECT_DELAY
+    DISCONNECT_DELAY,
+    IDLE_HOLD_MIN,
+    CONNECT_BACKOFF_MAX,
+    RETRY_BACKOFF_INITIAL,
+    RETRY_BACKOFF_MAX,
+    SLOT_WAIT_TIMEOUT,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    COMMAND_BATCH_WINDOW,
+    HISTORY_RECORD_TIMEOUT
+)
+from .device_store import DeviceStateStore
+from .drift import DriftEstimator
+from .eventbus import EventBus
+from .exceptions import NotConnectedError
+from .history import HistoryError, HistoryRecord, parse_record_count
+from .idle import AdaptiveIdle, IdlePolicy
+from .job import CoalescingJob
+from .mibeacon import HUMIDITY, TEMPERATURE, MiBeaconDecoder, MiBeaconError
+from .resolver import BleakScannerResolver, DeviceResolver
+from .retry import CircuitBreaker, ExponentialBackoff, RetryPolicy
+from .routing import ConnectionPath, rank_connection_paths
+from .timezone import split_utc_offset
+from .stats import (
+    ADAPTER_LOOKUP,
+    SLOT_WAIT,
+    CONNECT,
+    READ,
+    WRITE,
+    DISCONNECT,
+    CONNECT_ATTEMPTS,
+    CONNECT_FAILURES,
+    RETRIES,
+    TIMEOUTS,
+    SessionStats
+)
+from .trace import (
+    OP_CONNECT as TRACE_CONNECT,
+    OP_CONNECTED as TRACE_CONNECTED,
+    OP_DISCONNECT as TRACE_DISCONNECT,
+    OP_DISCONNECTED as TRACE_DISCONNECTED,
+    OP_READ as TRACE_READ,
+    OP_WRITE as TRACE_WRITE,
+    OP_SET_TIME as TRACE_SET_TIME,
+    OK,
+    FAILED,
+    TraceBuffer
 )
-from ..exceptions import NotConnectedError
 
 _LOGGER = logging.getLogger(__name__)
 TIME_CHAR = "EBE0CCB7-7A0A-4B0C-8A1A-6FF2997DA3A6"
 SETTINGS_CHAR = "EBE0CCBE-7A0A-4B0C-8A1A-6FF2997DA3A6"
+DATA_CHAR = "EBE0CCC1-7A0A-4B0C-8A1A-6FF2997DA3A6"
+NUM_RECORDS_CHAR = "EBE0CCB9-7A0A-4B0C-8A1A-6FF2997DA3A6"
+RECORD_IDX_CHAR = "EBE0CCBA-7A0A-4B0C-8A1A-6FF2997DA3A6"
+HISTORY_CHAR = "EBE0CCBC-7A0A-4B0C-8A1A-6FF2997DA3A6"
+REQUIRED_CHARS = (TIME_CHAR, SETTINGS_CHAR)
+OPTIONAL_CHARS = (DATA_CHAR, NUM_RECORDS_CHAR, RECORD_IDX_CHAR, HISTORY_CHAR)
+
+# Keys used to coalesce queued commands
+WRITE_TIME = "write_time"
+WRITE_SETTINGS = "write_settings"
+READ_TIME = "read_time"
+READ_SETTINGS = "read_settings"
+START_NOTIFY = "start_notify"
+DOWNLOAD_HISTORY = "download_history"
+
+GATT_HANDLES = "gatt_handles"
+USE_FAHRENHEIT = "use_fahrenheit"
+HISTORY_CURSOR = "history_cursor"
+TIME_SHIFT = "time_shift"
 
 
 class Mijia:
-    client: BleakClient = None
-    eventbus = EventBus()
-
-    use_fahrenheit = None
-    _connect_lock = asyncio.Lock()
-    _disconnect_task = None
-
     def __init__(
         self,
-        hass: HomeAssistant,
         mac: str,
-        name: str
+        name: str,
+        resolver: DeviceResolver | None = None,
+        connection_manager: ConnectionManager | None = None,
+        bindkey: bytes | None = None,
+        device_store: DeviceStateStore | None = None,
+        write_without_response: bool = False,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        idle_policy: IdlePolicy | None = None
     ):
         """Initialize the Mijia clock."""
-        self.hass = hass
         self.mac = mac
         self.name = name
+        self.resolver = resolver or BleakScannerResolver()
+        self.connection_manager = connection_manager or ConnectionManager()
+        self.device_store = device_store or DeviceStateStore()
+        self.client: BleakClientWithServiceCache | None = None
+        self._characteristics: dict[str, BleakGATTCharacteristic] = {}
+        self.write_without_response = write_without_response
+        self.retry_policy = retry_policy or ExponentialBackoff(
+            RETRY_BACKOFF_INITIAL,
+            RETRY_BACKOFF_MAX
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            CIRCUIT_BREAKER_THRESHOLD,
+            CIRCUIT_BREAKER_RESET_TIMEOUT
+        )
+        self.idle_policy = idle_policy or AdaptiveIdle(IDLE_HOLD_MIN, DISCONNECT_DELAY)
+        self._queue = CommandQueue(
+            self._ensure_connected,
+            self.delayed_disconnect,
+            COMMAND_BATCH_WINDOW
+        )
+        self.eventbus = EventBus()
+        self.stats = SessionStats()
+        # Restored from the last session, refreshed by the next connection
+        self.use_fahrenheit: bool | None = self.device_store.get(mac).get(USE_FAHRENHEIT)
+        self._config_stale = True
+        self._pending_use_fahrenheit: bool | None = None
+        # Shown again if a write fails before the unit was ever read
+        self._use_fahrenheit_before_write: bool | None = None
+        self.drift = DriftEstimator.from_dict(self.device_store.get(mac))
+        self._connect_lock = asyncio.Lock()
+        self.slot_wait_timeout = SLOT_WAIT_TIMEOUT
+        self._disconnect_task: asyncio.Task | None = None
+        self._adapter_source: str | None = None
+        self._streaming = False
+        self._closed = False
+        self.readings: dict[str, float | int] = {}
+        self._mibeacon = MiBeaconDecoder(mac, bindkey)
+        self.deduplicator = AdvertisementDeduplicator()
+        self.trace = TraceBuffer()
+        self._connect_job = CoalescingJob(
+            self.connect_if_needed,
+            RETRY_INTERVAL,
+            CONNECT_BACKOFF_MAX
+        )
 
     @property
     def is_connected(self):
         return self.client and self.client.is_connected
 
+    @property
+    def adapter_source(self) -> str | None:
+        return self._adapter_source
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._streaming
+
+    @property
+    def history_cursor(self) -> int:
+        """Index of the first history record that wasn't imported yet."""
+        return self.device_store.get(self.mac).get(HISTORY_CURSOR, 0)
+
+    @property
+    def time_shift(self) -> int:
+        """Seconds the clock's timestamp was shifted by to show a sub-hour UTC offset."""
+        return self.device_store.get(self.mac).get(TIME_SHIFT, 0)
+
+    def set_history_cursor(self, index: int):
+        self.device_store.update(self.mac, **{HISTORY_CURSOR: index})
+
+    def set_bindkey(self, bindkey: bytes | None):
+        self._mibeacon.set_bindkey(bindkey)
+
+    def handle_advertisement(self, service_data: bytes) -> bool:
+        """Update the readings from a MiBeacon advertisement.
+
+        Returns True if any of the readings changed.
+        """
+        try:
+            frame = self._mibeacon.decode(service_data)
+        except MiBeaconError as e:
+            _LOGGER.debug("Unable to decode advertisement from %s: %s", self.mac, e)
+            return False
+
+        return self._update_readings(frame.readings)
+
+    def _update_readings(self, readings: dict[str, float | int]) -> bool:
+        changed = {
+            key: value
+            for key, value in readings.items()
+            if self.readings.get(key) != value
+        }
+        if not changed:
+            return False
+
+        self.readings.update(changed)
+        self.eventbus.send(READINGS_UPDATED, self)
+        return True
+
     async def connect(self) -> bool:
+        if self._closed:
+            return False
+
         async with self._connect_lock:
             if self.client and self.client.is_connected:
                 return True
 
-            device = async_ble_device_from_address(self.hass, self.mac, connectable=True)
-            if device is None:
-                _LOGGER.error(f"No adapters can reach the device with address {self.mac}")
+            self.stats.increment(CONNECT_ATTEMPTS)
+            with self.stats.measure(ADAPTER_LOOKUP):
+                paths = rank_connection_paths(
+                    await self.resolver(self.mac),
+                    self.connection_manager,
+                    self.mac
+                )
+            if not paths:
+                _LOGGER.error("No adapters can reach the device with address %s", self.mac)
+                self.trace.record(TRACE_CONNECT, FAILED, error="no adapters")
+                self._connect_failed()
                 return False
-            self.client = BleakClient(device, disconnected_callback=self._on_disconnect)
 
-            _LOGGER.debug(f"Connecting to {self.mac}...")
-            try:
-                await self.client.connect()
-            except Exception as e:
-                _LOGGER.debug(f"Failed to connect to {self.mac}: {e}")
+            # Only wait for a busy adapter when none of them has a free slot
+            candidates = [
+                path for path in paths
+                if self.connection_manager.adapter(path.source).free > 0
+            ] or paths[:1]
+            for path in candidates:
+                if await self._connect_via(path):
+                    break
+            else:
+                self._connect_failed()
                 return False
 
-            await asyncio.sleep(2.0)  # give some time for service discovery
+            if not self._resolve_characteristics():
+                _LOGGER.debug("Services of %s are incomplete, clearing the cache", self.mac)
+                self.trace.record(TRACE_CONNECT, FAILED, adapter=self._adapter_source, error="incomplete services")
+                self.device_store.update(self.mac, **{GATT_HANDLES: None})
+                await self.client.clear_cache()
+                await self.disconnect()
+                self._connect_failed()
+                return False
 
-            _LOGGER.debug(f"Connected to {self.mac}")
+            self.trace.record(TRACE_CONNECTED, OK, adapter=self._adapter_source)
+            self.circuit_breaker.record_success()
+            self.eventbus.send(STATS_UPDATED, self)
             self.eventbus.send(DEVICE_CONNECTED, self)
 
-            if self.use_fahrenheit is None:
+            if self.use_fahrenheit is None or self._config_stale:
                 await self._read_config()
 
             return True
 
-    async def connect_if_needed(self):
-        if self.use_fahrenheit is None:
-            await self.connect()
-            await self.delayed_disconnect()
+    async def _connect_via(self, path: ConnectionPath) -> bool:
+        try:
+            with self.stats.measure(SLOT_WAIT):
+                await asyncio.wait_for(
+                    self.connection_manager.acquire(path.source, self.mac),
+                    self.slot_wait_timeout
+                )
+        except asyncio.TimeoutError:
+            # The slot may have been taken right as the wait timed out
+            self.connection_manager.release(path.source, self.mac)
+            self.trace.record(TRACE_CONNECT, FAILED, adapter=path.source, error="no free slot")
+            self.stats.increment(TIMEOUTS)
+            self.eventbus.send(STATS_UPDATED, self)
+            raise NotConnectedError(f"No connection slot of {path.source} became free for {self.mac}")
+        self._adapter_source = path.source
+
+        # Only trust the adapter's service cache once we know the layout
+        known_handles = self.device_store.get(self.mac).get(GATT_HANDLES)
+
+        self.trace.record(TRACE_CONNECT, adapter=path.source, rssi=path.rssi)
+        try:
+            with self.stats.measure(CONNECT):
+                self.client = await self._establish_connection(
+                    path,
+                    use_services_cache=known_handles is not None
+                )
+        except Exception as e:
+            self.trace.record(TRACE_CONNECT, FAILED, adapter=path.source, error=e)
+            self.client = None
+            self._release_slot()
+            return False
+        except BaseException:
+            # Cancelled midway, the slot mustn't stay taken
+            self.client = None
+            self._release_slot()
+            raise
+
+        return True
+
+    async def _establish_connection(
+        self,
+        path: ConnectionPath,
+        use_services_cache: bool
+    ) -> BleakClientWithServiceCache:
+        return await establish_connection(
+            BleakClientWithServiceCache,
+            path.device,
+            self.name,
+            disconnected_callback=self._on_disconnect,
+            max_attempts=1,
+            use_services_cache=use_services_cache
+        )
+
+    async def connect_if_needed(self) -> bool:
+        if self.use_fahrenheit is not None:
+            return True
+
+        connected = await self.connect()
+        await self.delayed_disconnect()
+        return connected
+
+    def schedule_connect_if_needed(self) -> bool:
+        """Schedule `connect_if_needed`, unless a run is pending or backing off."""
+        if self.use_fahrenheit is not None:
+            return False
+        return self._connect_job.schedule()
+
+    def cancel_scheduled_connect(self):
+        self._connect_job.cancel()
+
+    def cancel_commands(self):
+        self._queue.cancel()
 
     async def disconnect(self) -> bool:
         if self.client and self.client.is_connected:
-            _LOGGER.debug(f"Disconnecting from {self.mac}...")
-            await self.client.disconnect()
+            self.trace.record(TRACE_DISCONNECT, adapter=self._adapter_source)
+            with self.stats.measure(DISCONNECT):
+                await self.client.disconnect()
+            self._release_slot()
             return True
 
         return False
 
+    async def close(self):
+        """Release the tasks, listeners, connection and adapter slot of the clock.
+
+        The instance must not be used afterwards.
+        """
+        # Keeps late callers, like a stream being stopped, from starting new work
+        self._closed = True
+        self._streaming = False
+        # Nothing to roll back, the entities are gone
+        self._pending_use_fahrenheit = None
+        self.cancel_scheduled_connect()
+        self.cancel_commands()
+        disconnect_task = self._cancel_delayed_disconnect()
+        if disconnect_task is not None:
+            # It may be waiting on adapter slots shared with other clocks
+            await asyncio.wait([disconnect_task])
+
+        try:
+            await self.disconnect()
+        except Exception as e:
+            _LOGGER.debug("Failed to disconnect from %s: %s", self.mac, e)
+        self._release_slot()
+        self.client = None
+        self._characteristics = {}
+        self.eventbus.clear()
+
     async def set_time(
         self,
         timestamp: int,
-        timezone_offset: int | None = None
+        timezone_offset: float | None = None
     ) -> bool:
+        """Set the time of the clock, `timezone_offset` is in hours from UTC."""
         start_time = time.time()
 
         if timezone_offset is None:
-            is_dst = time.daylight and time.localtime().tm_isdst > 0
-            utc_offset = - (time.altzone if is_dst else time.timezone)
-            timezone_offset = int(utc_offset / 3600)
+            timezone_offset = time.localtime().tm_gmtoff / 3600
 
-        _LOGGER.debug(f"Set time to {timestamp}, tz offset: {timezone_offset}")
+        self.trace.record(TRACE_SET_TIME, timestamp=timestamp, timezone_offset=timezone_offset)
 
-        await self._ensure_connected()
-
-        # Account for time passed while connecting
-        timestamp = int(timestamp + (time.time() - start_time))
-
-        timestamp_bytes = self._get_bytes_from_time(
-            timestamp,
-            timezone_offset
-        )
+        async def _write_time():
+            hours, shift = split_utc_offset(timezone_offset)
+            # Account for time passed while queued and connecting
+            timestamp_bytes = self._get_bytes_from_time(
+                int(timestamp + (time.time() - start_time)) + shift,
+                hours
+            )
+            await self._write_gatt_char(TIME_CHAR, timestamp_bytes)
+            self.drift.record_sync(time.time())
+            self.device_store.update(self.mac, **{TIME_SHIFT: shift}, **self.drift.as_dict())
 
-        await self._write_gatt_char(TIME_CHAR, timestamp_bytes)
+        await self._submit(_write_time, WRITE_TIME)
 
         return True
 
     async def set_use_fahrenheit(self, use_fahrenheit: bool) -> bool:
-        await self._ensure_connected()
+        value = b"\x01" if use_fahrenheit else b"\xff"
 
-        if use_fahrenheit:
-            await self._write_gatt_char(SETTINGS_CHAR, b"\x01")
-        else:
-            await self._write_gatt_char(SETTINGS_CHAR, b"\xff")
-        await self._read_config()
+        async def _write_settings():
+            await self._write_gatt_char(SETTINGS_CHAR, value)
+
+        # Queue the write and the read back together so they share a session
+        results = await asyncio.gather(
+            self._submit(_write_settings, WRITE_SETTINGS),
+            self._submit(self._read_config, READ_SETTINGS),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
 
         return True
 
+    def set_use_fahrenheit_optimistic(self, use_fahrenheit: bool) -> asyncio.Future:
+        """Switch the unit right away and write it to the clock in the background.
+
+        The write is verified by the config read at the start of the next
+        session instead of an extra round trip now. If the write fails, the
+        unit last read from the clock, or else the one shown before, is restored.
+        """
+        value = b"\x01" if use_fahrenheit else b"\xff"
+        if self._pending_use_fahrenheit is None:
+            self._use_fahrenheit_before_write = self.use_fahrenheit
+        self._pending_use_fahrenheit = use_fahrenheit
+        self._set_use_fahrenheit_state(use_fahrenheit)
+
+        async def _write_settings():
+            await self._write_gatt_char(SETTINGS_CHAR, value)
+
+        def _written(future: asyncio.Future):
+            # Retrieved even if superseded, the coalesced write shares the result
+            failed = future.cancelled() or future.exception() is not None
+            if self._pending_use_fahrenheit != use_fahrenheit:
+                # Superseded by a later write
+                return
+
+            self._pending_use_fahrenheit = None
+            if failed:
+                _LOGGER.warning("Failed to change the unit of %s, rolling back", self.mac)
+                stored = self.device_store.get(self.mac).get(USE_FAHRENHEIT)
+                self._set_use_fahrenheit_state(
+                    stored if stored is not None else self._use_fahrenheit_before_write
+                )
+            else:
+                self.device_store.update(self.mac, **{USE_FAHRENHEIT: use_fahrenheit})
+                self._config_stale = True
+
+        future = self._submit(_write_settings, WRITE_SETTINGS)
+        future.add_done_callback(_written)
+        return future
+
+    async def measure_drift(self) -> float:
+        """Read the clock back and return how many seconds it is ahead of the real time."""
+        async def _read_time():
+            start_time = time.time()
+            data = await self._read_gatt_char(TIME_CHAR)
+            end_time = time.time()
+
+            # Assume the clock was read halfway through the round trip
+            # Sub-hour zones are set by shifting the clock's timestamp
+            device_time = unpack_from("<I", data)[0] - self.time_shift
+            drift = device_time - (start_time + end_time) / 2
+            _LOGGER.debug("%s drift: %.2fs, round trip: %.3fs", self.mac, drift, end_time - start_time)
+
+            self.drift.record_measurement(end_time, drift)
+            self.device_store.update(self.mac, **self.drift.as_dict())
+            return drift
+
+        return await self._submit(_read_time, READ_TIME)
+
+    async def start_streaming(self):
+        """Subscribe to the live readings of the clock.
+
+        The connection is kept open until `stop_streaming` is called or the
+        clock disconnects.
+        """
+        async def _start_notify():
+            await self.client.start_notify(
+                self._characteristics.get(DATA_CHAR, DATA_CHAR),
+                self._on_data_notification
+            )
+            self._streaming = True
+
+        await self._submit(_start_notify, START_NOTIFY)
+
+    async def stop_streaming(self):
+        if not self._streaming:
+            return
+
+        self._streaming = False
+        if self.is_connected:
+            try:
+                await self.client.stop_notify(self._characteristics.get(DATA_CHAR, DATA_CHAR))
+            except Exception as e:
+                _LOGGER.debug("Failed to unsubscribe from %s: %s", self.mac, e)
+        await self.delayed_disconnect()
+
+    async def download_history(self, start_index: int | None = None) -> list[HistoryRecord]:
+        """Download the history records from `start_index` on, the persisted cursor by default.
+
+        The clock notifies all records back to back after the start index is
+        written, so catching up takes a single session however many there are.
+        The clock stamps the records with its own, possibly shifted, time; the
+        returned timestamps are corrected to UTC.
+        """
+        use_cursor = start_index is None
+        if use_cursor:
+            start_index = self.history_cursor
+
+        async def _download():
+            first_index = start_index
+            count, last_index = parse_record_count(await self._read_gatt_char(NUM_RECORDS_CHAR))
+            # The cursor points one past the last downloaded record
+            if last_index + 1 == first_index:
+                return []
+            if last_index + 1 < first_index:
+                # The clock was reset and numbers its records from 0 again
+                _LOGGER.info(
+                    "History index of %s went back from %s to %s, downloading from the start",
+                    self.mac, first_index, last_index
+                )
+                first_index = 0
+                if use_cursor:
+                    self.set_history_cursor(0)
+            if count == 0:
+                return []
+
+            # Older records than the clock retains are gone
+            first_index = max(first_index, last_index - count + 1)
+            _LOGGER.debug("Downloading history records %s-%s from %s", first_index, last_index, self.mac)
+
+            received: asyncio.Queue[bytes] = asyncio.Queue()
+            history_char = self._characteristics.get(HISTORY_CHAR, HISTORY_CHAR)
+            await self.client.start_notify(
+                history_char,
+                lambda sender, data: received.put_nowait(bytes(data))
+            )
+
+            records = []
+            time_shift = self.time_shift
+            try:
+                await self._write_gatt_char(RECORD_IDX_CHAR, pack("<I", first_index))
+                while True:
+                    try:
+                        data = await asyncio.wait_for(received.get(), HISTORY_RECORD_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        _LOGGER.debug("History download from %s stalled after %s records", self.mac, len(records))
+                        break
+
+                    try:
+                        record = HistoryRecord.from_bytes(data)
+                    except HistoryError as e:
+                        _LOGGER.debug("Skipping history record from %s: %s", self.mac, e)
+                        continue
+
+                    if record.index >= first_index:
+                        records.append(dataclasses.replace(
+                            record,
+                            timestamp=record.timestamp - time_shift
+                        ))
+                    if record.index >= last_index:
+                        break
+            finally:
+                if self.is_connected:
+                    await self.client.stop_notify(history_char)
+
+            return records
+
+        return await self._submit(_download, DOWNLOAD_HISTORY)
+
     async def delayed_disconnect(self):
         async def _delayed_disconnect():
-            if not self.client.is_connected:
+            if not self.is_connected:
                 return
 
+            hold_time = self.idle_policy.hold_time()
+            slots = self.connection_manager.adapter(self._adapter_source) \
+                if self._adapter_source is not None else None
             try:
-                await asyncio.sleep(DISCONNECT_DELAY)
+                if slots is None:
+                    await asyncio.sleep(hold_time)
+                else:
+                    # Give the slot up early when another device needs it
+                    try:
+                        await asyncio.wait_for(slots.wait_for_pressure(), hold_time)
+                        _LOGGER.debug("Releasing the slot of %s on %s early", self.mac, slots.source)
+                    except asyncio.TimeoutError:
+                        pass
                 await self.disconnect()
             except Exception as e:
-                _LOGGER.debug(f"Failed to disconnect. Error: {e}")
+                _LOGGER.debug("Failed to disconnect. Error: %s", e)
+
+        self._cancel_delayed_disconnect()
+        # Streaming holds the connection until it is stopped
+        if self._streaming or self._closed:
+            return
 
         loop = asyncio.get_running_loop()
-        if self._disconnect_task is not None:
-            self._disconnect_task.cancel()
         self._disconnect_task = loop.create_task(_delayed_disconnect())
 
+    def _cancel_delayed_disconnect(self) -> asyncio.Task | None:
+        disconnect_task, self._disconnect_task = self._disconnect_task, None
+        if disconnect_task is not None:
+            disconnect_task.cancel()
+        return disconnect_task
+
     async def _ensure_connected(self):
+        # The connection of the last session is reused, don't let its idle
+        # timer close it midway. It is re-armed when this session closes.
+        self._cancel_delayed_disconnect()
+
+        def raise_if_unreachable():
+            if not self.circuit_breaker.allow():
+                raise NotConnectedError(
+                    f"{self.mac} is unreachable, waiting for it to advertise again"
+                )
+
         async def wait_for_connected():
+            delays = self.retry_policy.delays()
             while not self.client or not self.client.is_connected:
+                raise_if_unreachable()
                 success = await self.connect()
                 if success:
                     _LOGGER.info("Successfully connected to the Bluetooth device.")
                     return
                 else:
-                    _LOGGER.error("Failed to connect. Retrying in %s seconds...", RETRY_INTERVAL)
-                    await asyncio.sleep(RETRY_INTERVAL)
+                    raise_if_unreachable()
+                    delay = next(delays)
+                    _LOGGER.error("Failed to connect. Retrying in %.1f seconds...", delay)
+                    self.stats.increment(RETRIES)
+                    await asyncio.sleep(delay)
 
         try:
             await asyncio.wait_for(wait_for_connected(), CONNECTION_TIMEOUT)
         except asyncio.TimeoutError:
             _LOGGER.error("Connection timeout.")
+            self.stats.increment(TIMEOUTS)
+            self.eventbus.send(STATS_UPDATED, self)
             raise NotConnectedError("Connection timeout")
 
+    def _resolve_characteristics(self) -> bool:
+        """Look up the characteristics we use once service discovery completed.
+
+        The handles are persisted so the next connection can use the
+        adapter's service cache instead of a full discovery.
+        """
+        characteristics = {}
+        for uuid in REQUIRED_CHARS:
+            characteristic = self.client.services.get_characteristic(uuid)
+            if characteristic is None:
+                return False
+            characteristics[uuid] = characteristic
+        for uuid in OPTIONAL_CHARS:
+            characteristic = self.client.services.get_characteristic(uuid)
+            if characteristic is not None:
+                characteristics[uuid] = characteristic
+
+        self._characteristics = characteristics
+        self.device_store.update(self.mac, **{
+            GATT_HANDLES: {uuid: char.handle for uuid, char in characteristics.items()}
+        })
+        return True
+
     async def _read_gatt_char(self, uuid: str) -> bytes:
         if self.client and self.client.is_connected:
-            return await self.client.read_gatt_char(uuid)
+            try:
+                with self.stats.measure(READ):
+                    data = await self.client.read_gatt_char(self._characteristics.get(uuid, uuid))
+            except Exception as e:
+                self.trace.record(TRACE_READ, FAILED, char=uuid, error=e)
+                raise
+            self.trace.record(TRACE_READ, OK, data, char=uuid)
+            return data
         else:
             raise NotConnectedError("Not connected")
 
     async def _write_gatt_char(self, uuid: str, data: bytes) -> bool:
-        _LOGGER.debug(f">> {uuid}: {data.hex()}")
-        await self.client.write_gatt_char(uuid, data)
-        await self.delayed_disconnect()
+        if not self.is_connected:
+            raise NotConnectedError("Not connected")
+
+        characteristic = self._characteristics.get(uuid)
+        response = not (
+            self.write_without_response
+            and characteristic is not None
+            and "write-without-response" in characteristic.properties
+        )
+        try:
+            with self.stats.measure(WRITE):
+                await self.client.write_gatt_char(characteristic or uuid, data, response=response)
+        except Exception as e:
+            self.trace.record(TRACE_WRITE, FAILED, data, char=uuid, response=response, error=e)
+            raise
+        self.trace.record(TRACE_WRITE, OK, data, char=uuid, response=response)
 
     async def _read_config(self):
-        use_fahrenheit = await self._read_gatt_char(SETTINGS_CHAR)
-        self.use_fahrenheit = use_fahrenheit == b"\x01"
+        use_fahrenheit = await self._read_gatt_char(SETTINGS_CHAR) == b"\x01"
+        self._config_stale = False
+        self.device_store.update(self.mac, **{USE_FAHRENHEIT: use_fahrenheit})
+        if self._pending_use_fahrenheit is not None:
+            # Keep showing the value that is about to be written
+            return
+
+        if self.use_fahrenheit is not None and use_fahrenheit != self.use_fahrenheit:
+            _LOGGER.debug("Unit of %s differs from the expected one, rolling back", self.mac)
+        self.use_fahrenheit = use_fahrenheit
         self.eventbus.send(CONFIG_UPDATED, self)
 
+    def _set_use_fahrenheit_state(self, use_fahrenheit: bool | None):
+        if use_fahrenheit == self.use_fahrenheit:
+            return
+        self.use_fahrenheit = use_fahrenheit
+        self.eventbus.send(CONFIG_UPDATED, self)
+
+    def _on_data_notification(self, sender, data: bytearray):
+        temperature, humidity = unpack_from("<hB", data)
+        self._update_readings({TEMPERATURE: temperature / 100, HUMIDITY: humidity})
+
     def _get_bytes_from_time(
         self,
         timestamp: int,
@@ -185,18 +726,35 @@ class Mijia:
         """Generate the bytes to set the time on the LYWSD02MMC clock with Daylight Saving Time adjustment.
         Args:
             timestamp (int): The timestamp to set
-            timezone_offset (int): The timezone offset in minutes
+            timezone_offset (int): The timezone offset in whole hours, may be negative
 
         Returns:
             bytes: The bytes needed to set the time of the device to `timestamp` considering the timezone offset.
         """
-        return pack('<IB', timestamp, timezone_offset)
+        return pack('<Ib', timestamp, timezone_offset)
+
+    def _submit(self, run, key):
+        if self._closed:
+            raise NotConnectedError(f"{self.mac} was closed")
+        self.idle_policy.record_command(time.monotonic())
+        return self._queue.submit(run, key)
+
+    def _connect_failed(self):
+        self.circuit_breaker.record_failure()
+        self.stats.increment(CONNECT_FAILURES)
+        self.eventbus.send(STATS_UPDATED, self)
+
+    def _release_slot(self):
+        if self._adapter_source is not None:
+            self.connection_manager.release(self._adapter_source, self.mac)
+            self._adapter_source = None
 
     def _on_disconnect(self, client: BleakClient):
-        if self._disconnect_task is not None:
-            self._disconnect_task.cancel()
-            self._disconnect_task = None
+        self._cancel_delayed_disconnect()
 
-        _LOGGER.debug(f"Disconnected from {self.mac}")
+        self.trace.record(TRACE_DISCONNECTED, adapter=self._adapter_source)
+        self._streaming = False
         self.eventbus.send(DEVICE_DISCONNECTED, self)
         self.client = None
+        self._characteristics = {}
+        self._release_slot()
@@ -0,0 +1,55 @@
+"""Ways to find out which adapters can reach a device."""
+
+from typing import Awaitable, Callable
+
+from bleak import BleakScanner
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+from .routing import ConnectionPath
+
+# Returns the ways to reach the device with the given address
+DeviceResolver = Callable[[str], Awaitable[list[ConnectionPath]]]
+
+
+class BleakScannerResolver:
+    """Find devices with a local BleakScanner, for use outside Home Assistant.
+
+    Every device seen by `scan` is remembered, so a whole fleet can be
+    resolved from a single scan. Devices it missed are looked up one by one.
+    """
+
+    def __init__(self, adapter: str | None = None, timeout: float = 10.0):
+        self.adapter = adapter
+        self.timeout = timeout
+        self.discovered: dict[str, tuple[BLEDevice, AdvertisementData]] = {}
+
+    @property
+    def source(self) -> str:
+        return self.adapter or "default"
+
+    async def scan(self, timeout: float | None = None) -> dict[str, tuple[BLEDevice, AdvertisementData]]:
+        found = await BleakScanner.discover(
+            timeout=timeout or self.timeout,
+            return_adv=True,
+            **self._scanner_kwargs()
+        )
+        for device, advertisement in found.values():
+            self.discovered[device.address.upper()] = (device, advertisement)
+        return self.discovered
+
+    async def __call__(self, mac: str) -> list[ConnectionPath]:
+        discovered = self.discovered.get(mac.upper())
+        if discovered is not None:
+            device, advertisement = discovered
+            return [ConnectionPath(self.source, device, advertisement.rssi)]
+
+        device = await BleakScanner.find_device_by_address(
+            mac,
+            timeout=self.timeout,
+            **self._scanner_kwargs()
+        )
+        return [ConnectionPath(self.source, device)] if device is not None else []
+
+    def _scanner_kwargs(self) -> dict:
+        return {"adapter": self.adapter} if self.adapter else {}
@@ -0,0 +1,79 @@
+import random
+import time
+from typing import Iterator
+
+
+class RetryPolicy:
+    """Decide how long to wait between connection attempts."""
+
+    def delays(self) -> Iterator[float]:
+        raise NotImplementedError
+
+
+class ExponentialBackoff(RetryPolicy):
+    """Exponentially growing delays with random jitter.
+
+    The jitter spreads the retries of devices that failed at the same time,
+    so they don't all hit the adapter again on the same schedule.
+    """
+
+    def __init__(
+        self,
+        initial: float = 1.0,
+        maximum: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5
+    ):
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def delays(self) -> Iterator[float]:
+        delay = self.initial
+        while True:
+            yield random.uniform(delay * (1 - self.jitter), delay)
+            delay = min(delay * self.multiplier, self.maximum)
+
+
+class CircuitBreaker:
+    """Fail fast for a device that keeps failing to connect.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    connection attempts are refused until `reset_timeout` seconds have passed,
+    after which a single attempt is let through, or until `reset` is called,
+    e.g. because the device was heard advertising again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 600):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        return self.state != self.OPEN
+
+    def record_success(self) -> None:
+        self.reset()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        self.failures = 0
+        self._opened_at = None
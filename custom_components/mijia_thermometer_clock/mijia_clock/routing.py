@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Any
+
+from .connection_manager import ConnectionManager
+
+# A busy adapter is worth this many dBm of signal strength per used slot
+SLOT_PENALTY = 6
+UNKNOWN_RSSI = -100
+
+
+@dataclass
+class ConnectionPath:
+    """A way to reach a device: the adapter or proxy and the device it reported."""
+
+    source: str
+    device: Any
+    rssi: int | None = None
+
+
+def rank_connection_paths(
+    paths: list[ConnectionPath],
+    connection_manager: ConnectionManager,
+    mac: str
+) -> list[ConnectionPath]:
+    """Order connection paths from best to worst.
+
+    Paths through adapters with a free connection slot come first, ranked by
+    signal strength minus a penalty for every slot already in use, so that
+    concurrent sessions spread over the available adapters.
+    """
+    def score(path: ConnectionPath) -> tuple[bool, float]:
+        slots = connection_manager.adapter(path.source)
+        has_slot = mac in slots.holders or slots.free > 0
+        rssi = path.rssi if path.rssi is not None else UNKNOWN_RSSI
+        return has_slot, rssi - SLOT_PENALTY * len(slots.holders - {mac})
+
+    return sorted(paths, key=score, reverse=True)
@@ -0,0 +1,88 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+ADAPTER_LOOKUP = "adapter_lookup"
+SLOT_WAIT = "slot_wait"
+CONNECT = "connect"
+READ = "read"
+WRITE = "write"
+DISCONNECT = "disconnect"
+
+# Service discovery happens while connecting, so it is part of CONNECT
+PHASES = (ADAPTER_LOOKUP, SLOT_WAIT, CONNECT, READ, WRITE, DISCONNECT)
+
+CONNECT_ATTEMPTS = "connect_attempts"
+CONNECT_FAILURES = "connect_failures"
+RETRIES = "retries"
+TIMEOUTS = "timeouts"
+
+COUNTERS = (CONNECT_ATTEMPTS, CONNECT_FAILURES, RETRIES, TIMEOUTS)
+
+
+class RollingHistogram:
+    """Keep the most recent samples of a duration, in seconds."""
+
+    def __init__(self, size: int = 100):
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+
+    @property
+    def last(self) -> float | None:
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, percent: float) -> float | None:
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        index = round(percent / 100 * (len(samples) - 1))
+        return samples[index]
+
+    def summary(self) -> dict:
+        if not self._samples:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "last": round(self.last, 4),
+            "min": round(min(self._samples), 4),
+            "p50": round(self.percentile(50), 4),
+            "p90": round(self.percentile(90), 4),
+            "max": round(max(self._samples), 4)
+        }
+
+
+class SessionStats:
+    """Latency histograms and counters of the BLE session lifecycle of a device."""
+
+    def __init__(self, size: int = 100):
+        self.phases = {phase: RollingHistogram(size) for phase in PHASES}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @contextmanager
+    def measure(self, phase: str):
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[phase].add(time.monotonic() - start_time)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        self.counters[counter] += value
+
+    @property
+    def success_rate(self) -> float | None:
+        attempts = self.counters[CONNECT_ATTEMPTS]
+        if attempts == 0:
+            return None
+        return (attempts - self.counters[CONNECT_FAILURES]) / attempts
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": {phase: histogram.summary() for phase, histogram in self.phases.items()},
+            "counters": dict(self.counters),
+            "success_rate": self.success_rate
+        }
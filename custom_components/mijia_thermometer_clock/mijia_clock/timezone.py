@@ -0,0 +1,75 @@
+"""UTC offsets as the clock stores them, and upcoming changes of the offset."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+
+# Time zones change their offset at most a few times a year, far less often
+# than this, so a change can't be missed by probing at this step.
+TRANSITION_SEARCH_STEP = timedelta(hours=6)
+TRANSITION_SEARCH_HORIZON = timedelta(days=400)
+
+
+def split_utc_offset(utc_offset: float) -> tuple[int, int]:
+    """Split an offset in hours into whole hours and the remaining seconds.
+
+    The clock only stores whole hours, so the remainder of zones like +05:30
+    or -03:30 has to be added to the timestamp for it to show the local time.
+    """
+    seconds = round(utc_offset * 3600)
+    hours = int(seconds / 3600)
+    return hours, seconds - hours * 3600
+
+
+def get_utc_offset(time_zone: tzinfo, when: datetime) -> float:
+    """Offset of `time_zone` from UTC at `when`, in hours."""
+    return when.astimezone(time_zone).utcoffset().total_seconds() / 3600
+
+
+@dataclass(frozen=True)
+class Transition:
+    """A change of the UTC offset of a time zone."""
+
+    at: datetime
+    old_offset: float
+    new_offset: float
+
+    def as_dict(self) -> dict:
+        return {
+            "at": self.at.isoformat(),
+            "old_offset": self.old_offset,
+            "new_offset": self.new_offset
+        }
+
+
+def find_next_transition(
+    time_zone: tzinfo,
+    after: datetime,
+    horizon: timedelta = TRANSITION_SEARCH_HORIZON
+) -> Transition | None:
+    """Return the first offset change of `time_zone` after `after`, to the second.
+
+    Returns None when the offset doesn't change within `horizon`.
+    """
+    start = after.astimezone(timezone.utc).replace(microsecond=0)
+    end = start + horizon
+    offset = get_utc_offset(time_zone, start)
+
+    low = start
+    while low < end:
+        high = min(low + TRANSITION_SEARCH_STEP, end)
+        if get_utc_offset(time_zone, high) != offset:
+            break
+        low = high
+    else:
+        return None
+
+    # The offset changes somewhere in (low, high], narrow it down
+    while high - low > timedelta(seconds=1):
+        middle = low + timedelta(seconds=(high - low).total_seconds() // 2)
+        if get_utc_offset(time_zone, middle) == offset:
+            low = middle
+        else:
+            high = middle
+
+    return Transition(high, offset, get_utc_offset(time_zone, high))
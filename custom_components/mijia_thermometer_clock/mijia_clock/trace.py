@@ -0,0 +1,82 @@
+"""Per-device trace of the latest BLE operations."""
+
+import json
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+TRACE_SIZE = 256
+
+# Traced operations
+OP_ADVERTISEMENT = "advertisement"
+OP_CONNECT = "connect"
+OP_CONNECTED = "connected"
+OP_DISCONNECT = "disconnect"
+OP_DISCONNECTED = "disconnected"
+OP_READ = "read"
+OP_WRITE = "write"
+OP_SET_TIME = "set_time"
+
+# Outcomes
+OK = "ok"
+FAILED = "failed"
+
+
+class TraceBuffer:
+    """Bounded buffer of structured trace events.
+
+    Recording only appends a tuple, nothing is formatted until the buffer
+    is dumped, so tracing can stay on for a whole fleet.
+    """
+
+    def __init__(self, size: int = TRACE_SIZE):
+        self._events: deque[tuple] = deque(maxlen=size)
+        self.recorded = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def record(
+        self,
+        operation: str,
+        outcome: str | None = None,
+        data: bytes | None = None,
+        **details: Any
+    ) -> None:
+        self._events.append((time.time(), operation, outcome, data, details))
+        self.recorded += 1
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def dump(self) -> list[dict[str, Any]]:
+        events = []
+        for timestamp, operation, outcome, data, details in self._events:
+            event = {
+                "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                "operation": operation
+            }
+            if outcome is not None:
+                event["outcome"] = outcome
+            if data is not None:
+                event["data"] = bytes(data).hex()
+            event.update({
+                key: value if isinstance(value, (int, float, bool, type(None))) else str(value)
+                for key, value in details.items()
+            })
+            events.append(event)
+        return events
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "dropped": self.recorded - len(self._events),
+            "events": self.dump()
+        }
+
+    def export(self, path: str, **context: Any) -> None:
+        """Append the events as JSON lines, tagged with `context`, for offline analysis."""
+        with open(path, "a") as file:
+            for event in self.dump():
+                file.write(json.dumps({**context, **event}) + "\n")
@@ -0,0 +1,95 @@
+"""Rate-limited publishing of the entity states of all clocks."""
+
+from __future__ import annotations
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+
+from .const import STATE_PUBLISH_WINDOW
+
+
+def _fingerprint(entity: Entity) -> tuple[Any, ...]:
+    return (
+        entity.available,
+        entity.state,
+        entity.icon,
+        dict(entity.extra_state_attributes or {})
+    )
+
+
+class StatePublisher:
+    """Write entity states at most once per `window` seconds per entity.
+
+    The first update of an entity is written right away. Further updates
+    within the window are merged into a single write at its end, and writes
+    that wouldn't change the state or attributes are skipped, so radio noise
+    like connect flapping doesn't reach the state machine and recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float = STATE_PUBLISH_WINDOW):
+        self.hass = hass
+        self.window = window
+        self.counters = {"requested": 0, "written": 0, "merged": 0, "unchanged": 0}
+        self._pending: dict[Entity, None] = {}
+        self._written_at: dict[Entity, float] = {}
+        self._fingerprints: dict[Entity, tuple[Any, ...]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_publish(self, entity: Entity) -> None:
+        self.counters["requested"] += 1
+        if entity in self._pending:
+            self.counters["merged"] += 1
+            return
+
+        written_at = self._written_at.get(entity)
+        if written_at is None or time.monotonic() - written_at >= self.window:
+            self._write(entity)
+            return
+
+        self._pending[entity] = None
+        if self._unsub is None:
+            self._unsub = async_call_later(self.hass, self.window, self._flush)
+
+    @callback
+    def async_forget(self, entity: Entity) -> None:
+        """Drop the state kept for a removed entity."""
+        self._pending.pop(entity, None)
+        self._written_at.pop(entity, None)
+        self._fingerprints.pop(entity, None)
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._pending.clear()
+
+    def as_dict(self) -> dict:
+        return {
+            **self.counters,
+            "suppressed": self.counters["merged"] + self.counters["unchanged"],
+            "pending": len(self._pending)
+        }
+
+    @callback
+    def _flush(self, _now) -> None:
+        self._unsub = None
+        pending, self._pending = self._pending, {}
+        for entity in pending:
+            self._write(entity)
+
+    @callback
+    def _write(self, entity: Entity) -> None:
+        fingerprint = _fingerprint(entity)
+        if self._fingerprints.get(entity) == fingerprint:
+            self.counters["unchanged"] += 1
+            return
+
+        entity.async_write_ha_state()
+        self._fingerprints[entity] = fingerprint
+        self._written_at[entity] = time.monotonic()
+        self.counters["written"] += 1
@@ -0,0 +1,33 @@
+"""Resolve clocks through the Home Assistant Bluetooth integration."""
+
+from __future__ import annotations
+
+from homeassistant.components.bluetooth import async_ble_device_from_address
+from homeassistant.core import HomeAssistant
+
+from .mijia_clock.routing import ConnectionPath
+
+
+def _get_adapter_source(device) -> str:
+    details = device.details if isinstance(device.details, dict) else {}
+    return details.get("source") or details.get("path") or "default"
+
+
+class HassDeviceResolver:
+    """Find the adapter or proxy Home Assistant reaches a device through.
+
+    Home Assistant's Bluetooth client picks the adapter or proxy to connect
+    through on its own, by signal strength and free connection slots, so
+    there's nothing to route. The connection is accounted against the one it
+    currently hears the device best through, which is the one it normally
+    picks.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+
+    async def __call__(self, mac: str) -> list[ConnectionPath]:
+        device = async_ble_device_from_address(self.hass, mac, connectable=True)
+        if device is None:
+            return []
+        return [ConnectionPath(_get_adapter_source(device), device)]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.const import CONF_NAME, PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+
+from .const import READINGS_UPDATED, STATS_UPDATED
+from .entity import async_device_device_info_fn, async_get_state_publisher
+from .mijia_clock import Mijia
+from .mijia_clock.mibeacon import BATTERY, HUMIDITY, TEMPERATURE
+from .mijia_clock.stats import CONNECT, COUNTERS, SessionStats
+
+SENSOR_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key=TEMPERATURE,
+        name="Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS
+    ),
+    SensorEntityDescription(
+        key=HUMIDITY,
+        name="Humidity",
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE
+    ),
+    SensorEntityDescription(
+        key=BATTERY,
+        name="Battery",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE
+    )
+)
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    instance: Mijia = config_entry.runtime_data
+    async_add_entities([
+        MijiaReadingSensor(instance, config_entry, description)
+        for description in SENSOR_DESCRIPTIONS
+    ] + [
+        MijiaConnectTimeSensor(instance, config_entry),
+        MijiaConnectionSuccessRateSensor(instance, config_entry)
+    ])
+
+
+class MijiaReadingSensor(SensorEntity):
+    """Reading passively received from the clock's advertisements."""
+
+    def __init__(
+        self,
+        instance: Mijia,
+        config_entry: ConfigEntry,
+        description: SensorEntityDescription
+    ):
+        self._instance: Mijia = instance
+        self._config_entry = config_entry
+        self.entity_description = description
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {description.name}"
+        self._attr_unique_id = f"{config_entry.data[CONF_NAME]}_{description.key}"
+        self._attr_native_value = instance.readings.get(description.key)
+
+    async def async_added_to_hass(self) -> None:
+        self._publisher = async_get_state_publisher(self)
+        self.async_on_remove(
+            self._instance.eventbus.add_listener(READINGS_UPDATED, self.readings_updated)
+        )
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return async_device_device_info_fn(self._instance, self._config_entry.data[CONF_NAME])
+
+    @callback
+    def readings_updated(self, instance: Mijia):
+        value = self._instance.readings.get(self.entity_description.key)
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self._publisher.async_publish(self)
+
+
+class MijiaStatsSensor(SensorEntity):
+    """Base class for the diagnostic sensors fed by the session statistics."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _key: str
+    _label: str
+
+    def __init__(self, instance: Mijia, config_entry: ConfigEntry):
+        self._instance: Mijia = instance
+        self._config_entry = config_entry
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {self._label}"
+        self._attr_unique_id = f"{config_entry.data[CONF_NAME]}_{self._key}"
+        self._update_from_stats(instance.stats)
+
+    async def async_added_to_hass(self) -> None:
+        self._publisher = async_get_state_publisher(self)
+        self.async_on_remove(
+            self._instance.eventbus.add_listener(STATS_UPDATED, self.stats_updated)
+        )
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return async_device_device_info_fn(self._instance, self._config_entry.data[CONF_NAME])
+
+    def _update_from_stats(self, stats: SessionStats):
+        raise NotImplementedError
+
+    @callback
+    def stats_updated(self, instance: Mijia):
+        self._update_from_stats(self._instance.stats)
+        self._publisher.async_publish(self)
+
+
+class MijiaConnectTimeSensor(MijiaStatsSensor):
+    """Median time needed to establish a connection."""
+
+    _key = "connect_time"
+    _label = "Connect time"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+
+    def _update_from_stats(self, stats: SessionStats):
+        histogram = stats.phases[CONNECT]
+        median = histogram.percentile(50)
+        self._attr_native_value = round(median * 1000) if median is not None else None
+        p90 = histogram.percentile(90)
+        self._attr_extra_state_attributes = {
+            "p90": round(p90 * 1000) if p90 is not None else None,
+            "samples": histogram.count
+        }
+
+
+class MijiaConnectionSuccessRateSensor(MijiaStatsSensor):
+    """Share of connection attempts that succeeded."""
+
+    _key = "connection_success_rate"
+    _label = "Connection success rate"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_icon = "mdi:bluetooth-settings"
+
+    def _update_from_stats(self, stats: SessionStats):
+        success_rate = stats.success_rate
+        self._attr_native_value = round(success_rate * 100, 1) if success_rate is not None else None
+        self._attr_extra_state_attributes = {
+            counter: stats.counters[counter] for counter in COUNTERS
+        }
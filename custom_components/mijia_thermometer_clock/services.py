@@ -1,47 +1,165 @@
 from __future__ import annotations
+import asyncio
+import logging
 from datetime import datetime
+from typing import Any
 import voluptuous as vol
 
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse
+)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     CONF_TIME,
-    SERVICE_SET_TIME
+    SERVICE_SET_TIME,
+    SERVICE_SYNC_TIME,
+    SERVICE_SYNC_HISTORY
 )
+from .history import async_import_history
+from .exceptions import MijiaError
 from .mijia_clock import Mijia
+from .mijia_clock.bulk import sync_time_on
+
+_LOGGER = logging.getLogger(__name__)
 
 SET_TIME_SCHEMA = vol.Schema({
     vol.Required(ATTR_DEVICE_ID): str,
     vol.Required(CONF_TIME): cv.datetime
 })
 
+SYNC_TIME_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [str]),
+    vol.Optional(CONF_TIME): cv.datetime
+})
+
+SYNC_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [str])
+})
+
+
+def _get_time_args(time: datetime) -> tuple[int, float | None]:
+    timezone_offset = None
+    if time.tzinfo is not None:
+        timezone_offset = time.utcoffset().total_seconds() / 3600
+    return int(time.timestamp()), timezone_offset
+
+
+def _get_loaded_instances(hass: HomeAssistant) -> list[Mijia]:
+    return [
+        entry.runtime_data
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
 def async_register_services(hass: HomeAssistant) -> None:
     async def async_set_time(call: ServiceCall) -> None:
         """Set time"""
-        mac: str = _get_device_mac(hass, call)
+        mac: str = _get_device_mac(hass, call.data[ATTR_DEVICE_ID])
         time: datetime = call.data["time"]
 
-        for entry in hass.config_entries.async_entries(DOMAIN):
-            instance: Mijia = entry.runtime_data
+        for instance in _get_loaded_instances(hass):
             if instance.mac != mac:
                 continue
 
-            timezone_offset = None
-            if time.tzinfo is not None:
-                timezone_offset = int(time.utcoffset().total_seconds() / 3600)
-            timestamp = int(time.timestamp())
+            timestamp, timezone_offset = _get_time_args(time)
+            try:
+                await instance.set_time(timestamp, timezone_offset)
+            except MijiaError as e:
+                raise HomeAssistantError(f"Failed to set the time on {instance.name}: {e}") from e
+
+    async def async_sync_time(call: ServiceCall) -> ServiceResponse:
+        """Set time on many clocks at once"""
+        time: datetime = call.data.get(CONF_TIME) or dt_util.now()
+        timestamp, timezone_offset = _get_time_args(time)
+
+        instances, unavailable = _get_selected_instances(call)
+        results = await sync_time_on(instances, timestamp, timezone_offset)
+        for result in unavailable:
+            result["latency"] = None
+        return {"results": _with_device_ids(results) + unavailable}
+
+    async def async_sync_history(call: ServiceCall) -> ServiceResponse:
+        """Import the new history records of many clocks at once"""
+        async def _sync(instance: Mijia) -> dict[str, Any]:
+            result = {
+                "name": instance.name,
+                "mac": instance.mac,
+                "success": False,
+                "records": 0,
+                "error": None
+            }
+            try:
+                result["records"] = await async_import_history(hass, instance)
+                result["success"] = True
+            except Exception as e:
+                _LOGGER.debug(f"Failed to import history from {instance.mac}: {e}")
+                result["error"] = str(e) or type(e).__name__
+            return result
+
+        instances, unavailable = _get_selected_instances(call)
+        results = await asyncio.gather(*(_sync(instance) for instance in instances))
+        for result in unavailable:
+            result["records"] = 0
+        return {"results": _with_device_ids(list(results)) + unavailable}
+
+    def _get_selected_instances(call: ServiceCall) -> tuple[list[Mijia], list[dict[str, Any]]]:
+        """Get the loaded clocks a call selects, and a failed result for
+        each selected device that isn't one of them."""
+        instances = _get_loaded_instances(hass)
+        if ATTR_DEVICE_ID not in call.data:
+            return instances, []
+
+        device_registry = dr.async_get(hass)
+        instances_by_mac = {instance.mac: instance for instance in instances}
+        selected = []
+        unavailable = []
+        for device_id in call.data[ATTR_DEVICE_ID]:
+            device_entry = device_registry.async_get(device_id)
+            mac = _get_device_mac(hass, device_id)
+            instance = instances_by_mac.get(mac)
+            if instance is not None:
+                if instance not in selected:
+                    selected.append(instance)
+                continue
+
+            if device_entry is None:
+                error = "Unknown device"
+            elif mac is None:
+                error = "Not a Bluetooth device"
+            else:
+                error = "Clock is not loaded"
+            unavailable.append({
+                "name": device_entry and (device_entry.name_by_user or device_entry.name),
+                "mac": mac,
+                "success": False,
+                "error": error,
+                "device_id": device_id
+            })
+        return selected, unavailable
 
-            await instance.set_time(timestamp, timezone_offset)
-            await instance.disconnect()
+    def _with_device_ids(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        device_registry = dr.async_get(hass)
+        for result in results:
+            device_entry = device_registry.async_get_device(
+                connections={(CONNECTION_BLUETOOTH, result["mac"])}
+            )
+            result["device_id"] = device_entry.id if device_entry else None
+        return results
 
-    def _get_device_mac(hass, call):
+    def _get_device_mac(hass, device_id):
         device_registry = dr.async_get(hass)
-        device_entry = device_registry.async_get(call.data[ATTR_DEVICE_ID])
+        device_entry = device_registry.async_get(device_id)
 
         if device_entry is None:
             return
@@ -59,4 +177,20 @@ def async_register_services(hass: HomeAssistant) -> None:
         SERVICE_SET_TIME,
         async_set_time,
         schema=SET_TIME_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SYNC_TIME,
+        async_sync_time,
+        schema=SYNC_TIME_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SYNC_HISTORY,
+        async_sync_history,
+        schema=SYNC_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
     )
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""Staggered startup of the Mijia clocks."""
+
+from __future__ import annotations
+import logging
+import time
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, DEFAULT_STARTUP_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StartupScheduler:
+    """Spread the initial work of the clocks evenly over a window.
+
+    While Home Assistant starts, the work of each clock is delayed by its
+    position among the configured clocks, so the connections it opens
+    don't all compete for the adapters at once. Clocks set up once Home
+    Assistant is running start right away.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float = DEFAULT_STARTUP_WINDOW):
+        self.hass = hass
+        self.window = window
+        self._created_at = time.monotonic()
+        self._pending: dict[str, CALLBACK_TYPE] = {}
+
+    def is_pending(self, entry_id: str) -> bool:
+        return entry_id in self._pending
+
+    @callback
+    def async_schedule(self, entry: ConfigEntry, job: Callable[[], None]) -> None:
+        self.async_cancel(entry.entry_id)
+        if self.hass.state is CoreState.running:
+            job()
+            return
+
+        entry_ids = [
+            config_entry.entry_id
+            for config_entry in self.hass.config_entries.async_entries(DOMAIN)
+        ]
+        position = entry_ids.index(entry.entry_id) if entry.entry_id in entry_ids else 0
+        delay = self.window * position / max(len(entry_ids), 1)
+        delay = max(delay - (time.monotonic() - self._created_at), 0)
+        _LOGGER.debug(f"Starting {entry.title} in {delay:.1f}s")
+
+        @callback
+        def _async_run(_now) -> None:
+            del self._pending[entry.entry_id]
+            job()
+
+        self._pending[entry.entry_id] = async_call_later(self.hass, delay, _async_run)
+
+    @callback
+    def async_cancel(self, entry_id: str) -> None:
+        unsub = self._pending.pop(entry_id, None)
+        if unsub is not None:
+            unsub()
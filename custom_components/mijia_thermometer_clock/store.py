@@ -0,0 +1,33 @@
+"""Persistent storage of the last known state of every Mijia clock."""
+
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .mijia_clock.device_store import DeviceStateStore
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.devices"
+SAVE_DELAY = 10
+
+
+class MijiaDeviceStore(DeviceStateStore):
+    """Device state store backed by Home Assistant's storage helper."""
+
+    def __init__(self, hass: HomeAssistant):
+        super().__init__()
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY
+        )
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    @callback
+    def _changed(self) -> None:
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
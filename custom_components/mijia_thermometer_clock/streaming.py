@@ -0,0 +1,147 @@
+"""Live readings of Mijia clocks over GATT notifications."""
+
+from __future__ import annotations
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_STREAMING,
+    CONF_STREAM_DURATION,
+    CONF_STREAM_INTERVAL,
+    DEVICE_DISCONNECTED,
+    DEFAULT_STREAM_DURATION,
+    DEFAULT_STREAM_INTERVAL,
+    RETRY_INTERVAL
+)
+from .data import async_get_domain_data
+from .mijia_clock import Mijia
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StreamingScheduler:
+    """Stream the readings of a clock for `duration` out of every `interval` seconds.
+
+    A connection is held open while streaming, so the duty cycle bounds how
+    long the clock's battery and the adapter's connection slot are used.
+    Streaming never stops when the duration covers the whole interval.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        instance: Mijia,
+        duration: int,
+        interval: int
+    ):
+        self.hass = hass
+        self._instance = instance
+        self.duration = duration
+        self.interval = interval
+        self._running = False
+        self._active = False
+        self._unsub: CALLBACK_TYPE | None = None
+        self._unsub_disconnected: CALLBACK_TYPE | None = None
+
+    @property
+    def continuous(self) -> bool:
+        return self.duration >= self.interval
+
+    @callback
+    def async_start(self) -> None:
+        self._running = True
+        self._unsub_disconnected = self._instance.eventbus.add_listener(
+            DEVICE_DISCONNECTED,
+            self._disconnected
+        )
+        self._schedule(0, self._async_start_window)
+
+    @callback
+    def async_stop(self) -> None:
+        self._running = False
+        self._cancel()
+        if self._unsub_disconnected is not None:
+            self._unsub_disconnected()
+            self._unsub_disconnected = None
+        if self._active:
+            self._active = False
+            self.hass.async_create_task(self._instance.stop_streaming())
+
+    @callback
+    def _cancel(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _schedule(self, delay: float, action) -> None:
+        self._cancel()
+        self._unsub = async_call_later(self.hass, delay, action)
+
+    @callback
+    def _disconnected(self, instance: Mijia) -> None:
+        if not self._active:
+            return
+        # Lost the connection in the middle of a window, start a new one
+        _LOGGER.debug(f"Streaming from {instance.mac} interrupted")
+        self._active = False
+        self._schedule(RETRY_INTERVAL, self._async_start_window)
+
+    async def _async_start_window(self, _now) -> None:
+        self._unsub = None
+        try:
+            await self._instance.start_streaming()
+        except Exception as e:
+            _LOGGER.debug(f"Failed to stream from {self._instance.mac}: {e}")
+            if self._running:
+                self._schedule(RETRY_INTERVAL, self._async_start_window)
+            return
+
+        if not self._running:
+            # Stopped while subscribing
+            await self._instance.stop_streaming()
+            return
+
+        self._active = True
+        if not self.continuous:
+            self._schedule(self.duration, self._async_end_window)
+
+    async def _async_end_window(self, _now) -> None:
+        self._unsub = None
+        self._active = False
+        await self._instance.stop_streaming()
+        self._schedule(self.interval - self.duration, self._async_start_window)
+
+
+@callback
+def async_update_streaming(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Start, restart or stop the streaming of an entry according to its options."""
+    schedulers = async_get_domain_data(hass).streaming_schedulers
+    scheduler = schedulers.get(entry.entry_id)
+    enabled = entry.options.get(CONF_STREAMING, False)
+    duration = entry.options.get(CONF_STREAM_DURATION, DEFAULT_STREAM_DURATION)
+    interval = entry.options.get(CONF_STREAM_INTERVAL, DEFAULT_STREAM_INTERVAL)
+
+    if scheduler is not None:
+        if enabled and (scheduler.duration, scheduler.interval) == (duration, interval):
+            return
+        async_stop_streaming(hass, entry)
+
+    if enabled:
+        scheduler = schedulers[entry.entry_id] = StreamingScheduler(
+            hass,
+            entry.runtime_data,
+            duration,
+            interval
+        )
+        scheduler.async_start()
+
+
+@callback
+def async_stop_streaming(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    scheduler = async_get_domain_data(hass).streaming_schedulers.pop(entry.entry_id, None)
+    if scheduler is not None:
+        scheduler.async_stop()
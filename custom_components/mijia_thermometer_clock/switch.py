@@ -4,9 +4,10 @@ from homeassistant.const import CONF_NAME
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.core import callback
 
 from .const import CONFIG_UPDATED
-from .entity import async_device_device_info_fn
+from .entity import async_device_device_info_fn, async_get_state_publisher
 from .mijia_clock import Mijia
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -20,22 +21,27 @@ class MijiaTemperatureUnitSwitch(SwitchEntity):
         self._config_entry = config_entry
         self._attr_name = f"{config_entry.data[CONF_NAME]} Use Fahrenheit"
         self._attr_unique_id = f"{instance.name}_use_fahrenheit"
-        self._attr_is_on = None
+        self._attr_is_on = instance.use_fahrenheit
         self._attr_icon = "mdi:temperature-fahrenheit"
         self._attr_extra_state_attributes = {}
 
-        instance.eventbus.add_listener(CONFIG_UPDATED, self.config_updated)
+    async def async_added_to_hass(self) -> None:
+        self._publisher = async_get_state_publisher(self)
+        self.async_on_remove(
+            self._instance.eventbus.add_listener(CONFIG_UPDATED, self.config_updated)
+        )
 
     @property
     def device_info(self) -> DeviceInfo:
         return async_device_device_info_fn(self._instance, self._config_entry.data[CONF_NAME])
 
     async def async_turn_on(self, **kwargs):
-        await self._instance.set_use_fahrenheit(True)
+        self._instance.set_use_fahrenheit_optimistic(True)
 
     async def async_turn_off(self, **kwargs):
-        await self._instance.set_use_fahrenheit(False)
+        self._instance.set_use_fahrenheit_optimistic(False)
 
-    async def config_updated(self, instance: Mijia):
+    @callback
+    def config_updated(self, instance: Mijia):
         self._attr_is_on = self._instance.use_fahrenheit
-        self.async_write_ha_state()
+        self._publisher.async_publish(self)
@@ -0,0 +1,109 @@
+"""Automatic, drift-driven time sync of Mijia clocks."""
+
+from __future__ import annotations
+import logging
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_AUTO_TIME_SYNC,
+    DRIFT_TOLERANCE,
+    DRIFT_SYNC_THRESHOLD,
+    TIME_SYNC_MIN_INTERVAL,
+    TIME_SYNC_MAX_INTERVAL,
+    TIME_SYNC_DEFAULT_INTERVAL,
+    TIME_SYNC_RETRY_INTERVAL
+)
+from .data import async_get_domain_data
+from .mijia_clock import Mijia
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TimeSyncScheduler:
+    """Check the time of a clock as often as its measured drift requires.
+
+    Each check reads the time back from the clock. The clock is only written
+    to when it drifted by more than DRIFT_SYNC_THRESHOLD seconds, and the next
+    check is planned for when it is expected to drift by DRIFT_TOLERANCE.
+    """
+
+    def __init__(self, hass: HomeAssistant, instance: Mijia):
+        self.hass = hass
+        self._instance = instance
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @property
+    def next_interval(self) -> float:
+        return self._instance.drift.next_check_interval(
+            DRIFT_TOLERANCE,
+            TIME_SYNC_MIN_INTERVAL,
+            TIME_SYNC_MAX_INTERVAL,
+            TIME_SYNC_DEFAULT_INTERVAL
+        )
+
+    @callback
+    def async_start(self) -> None:
+        drift = self._instance.drift
+        last_check = max(
+            (value for value in (drift.last_check_at, drift.last_sync_at) if value is not None),
+            default=None
+        )
+        delay = 0.0
+        if last_check is not None:
+            delay = max(last_check + self.next_interval - time.time(), 0.0)
+        self._schedule(delay)
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _schedule(self, delay: float) -> None:
+        self.async_stop()
+        _LOGGER.debug(f"Next time check of {self._instance.mac} in {delay:.0f}s")
+        self._unsub = async_call_later(self.hass, delay, self._async_check)
+
+    async def _async_check(self, _now) -> None:
+        self._unsub = None
+        try:
+            drift = await self._instance.measure_drift()
+            if abs(drift) >= DRIFT_SYNC_THRESHOLD:
+                now = dt_util.now()
+                await self._instance.set_time(
+                    int(now.timestamp()),
+                    now.utcoffset().total_seconds() / 3600
+                )
+        except Exception as e:
+            _LOGGER.debug(f"Time check of {self._instance.mac} failed: {e}")
+            self._schedule(TIME_SYNC_RETRY_INTERVAL)
+            return
+
+        self._schedule(self.next_interval)
+
+
+@callback
+def async_update_time_sync(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Start or stop the automatic time sync of an entry according to its options."""
+    schedulers = async_get_domain_data(hass).time_sync_schedulers
+    scheduler = schedulers.get(entry.entry_id)
+    enabled = entry.options.get(CONF_AUTO_TIME_SYNC, False)
+
+    if enabled and scheduler is None:
+        scheduler = schedulers[entry.entry_id] = TimeSyncScheduler(hass, entry.runtime_data)
+        scheduler.async_start()
+    elif not enabled and scheduler is not None:
+        async_stop_time_sync(hass, entry)
+
+
+@callback
+def async_stop_time_sync(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    scheduler = async_get_domain_data(hass).time_sync_schedulers.pop(entry.entry_id, None)
+    if scheduler is not None:
+        scheduler.async_stop()
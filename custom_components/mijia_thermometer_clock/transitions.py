@@ -0,0 +1,162 @@
+"""Follow the UTC offset changes of the configured time zone on all clocks."""
+
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, CONF_TRANSITION_SYNC, TRANSITION_PREWARM
+from .mijia_clock import Mijia
+from .mijia_clock.bulk import sync_time_on
+from .mijia_clock.timezone import Transition, find_next_transition
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TransitionPlanner:
+    """Set the new time on all clocks as soon as the UTC offset changes.
+
+    The next offset change of Home Assistant's time zone, like a DST switch,
+    is planned ahead. `prewarm` seconds before it, connections to the clocks
+    are opened and held, so right at the boundary the new time is written to
+    the whole fleet in one wave, as fast as the adapter slots allow.
+    """
+
+    def __init__(self, hass: HomeAssistant, prewarm: float = TRANSITION_PREWARM):
+        self.hass = hass
+        self.prewarm = prewarm
+        self.next_transition: Transition | None = None
+        self.last_wave: dict | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._unsub_config: CALLBACK_TYPE | None = None
+        self._prewarm_tasks: dict[Mijia, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._unsub_config is not None
+
+    @callback
+    def async_start(self) -> None:
+        if self._unsub_config is None:
+            self._unsub_config = self.hass.bus.async_listen(
+                EVENT_CORE_CONFIG_UPDATE,
+                self._async_config_updated
+            )
+        self._async_plan(dt_util.utcnow())
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_config is not None:
+            self._unsub_config()
+            self._unsub_config = None
+        self._async_cancel()
+
+    @callback
+    def async_forget(self, instance: Mijia) -> None:
+        """Stop holding on to an unloaded clock."""
+        task = self._prewarm_tasks.pop(instance, None)
+        if task is not None:
+            task.cancel()
+
+    def as_dict(self) -> dict:
+        return {
+            "next_transition": self.next_transition.as_dict() if self.next_transition else None,
+            "last_wave": self.last_wave
+        }
+
+    @callback
+    def _async_config_updated(self, event: Event) -> None:
+        # The time zone may have changed
+        self._async_plan(dt_util.utcnow())
+
+    @callback
+    def _async_cancel(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+        for instance, task in self._prewarm_tasks.items():
+            task.cancel()
+            self.hass.async_create_task(instance.disconnect())
+        self._prewarm_tasks.clear()
+
+    @callback
+    def _async_plan(self, after: datetime) -> None:
+        self._async_cancel()
+        time_zone = dt_util.get_time_zone(self.hass.config.time_zone)
+        self.next_transition = transition = (
+            find_next_transition(time_zone, after) if time_zone else None
+        )
+        if transition is None:
+            _LOGGER.debug(f"No upcoming UTC offset change in {self.hass.config.time_zone}")
+            return
+
+        _LOGGER.debug(
+            f"UTC offset changes from {transition.old_offset:+g}h to "
+            f"{transition.new_offset:+g}h at {transition.at.isoformat()}"
+        )
+        self._unsubs = [
+            async_track_point_in_utc_time(
+                self.hass,
+                self._async_prewarm,
+                max(transition.at - timedelta(seconds=self.prewarm), dt_util.utcnow())
+            ),
+            async_track_point_in_utc_time(self.hass, self._async_wave, transition.at)
+        ]
+
+    def _get_instances(self) -> list[Mijia]:
+        return [
+            entry.runtime_data
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+            and entry.options.get(CONF_TRANSITION_SYNC, True)
+        ]
+
+    @callback
+    def _async_prewarm(self, _now) -> None:
+        instances = self._get_instances()
+        _LOGGER.debug(f"Connecting to {len(instances)} clock(s) ahead of the UTC offset change")
+        for instance in instances:
+            self._prewarm_tasks[instance] = self.hass.async_create_background_task(
+                self._async_connect(instance),
+                f"{DOMAIN} prewarm {instance.mac}"
+            )
+
+    async def _async_connect(self, instance: Mijia) -> None:
+        # Clocks beyond the free adapter slots wait for one here, and get it
+        # as soon as the clocks ahead of them are done with the wave
+        try:
+            await instance.connect()
+        except Exception as e:
+            _LOGGER.debug(f"Failed to connect to {instance.mac} ahead of the offset change: {e}")
+
+    async def _async_wave(self, _now) -> None:
+        transition = self.next_transition
+        self._unsubs = []
+        # The sessions of the wave take over the held connections, and their
+        # idle disconnect releases them
+        self._prewarm_tasks.clear()
+
+        start_time = time.monotonic()
+        results = await sync_time_on(
+            self._get_instances(),
+            int(time.time()),
+            transition.new_offset
+        )
+        succeeded = sum(1 for result in results if result["success"])
+        self.last_wave = {
+            **transition.as_dict(),
+            "clocks": len(results),
+            "succeeded": succeeded,
+            "duration": round(time.monotonic() - start_time, 3)
+        }
+        _LOGGER.info(
+            f"Set the new UTC offset {transition.new_offset:+g}h on "
+            f"{succeeded}/{len(results)} clock(s)"
+        )
+        self._async_plan(transition.at)
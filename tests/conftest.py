@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+# The driver and the simulator don't need Home Assistant, import them on their own
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "custom_components" / "mijia_thermometer_clock"))
@@ -0,0 +1,89 @@
+"""Batching and cancellation of the commands of a device."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.simulator import SimulatedAdapter, SimulatedClock, SimulatedMijia
+from mijia_clock.command_queue import CommandQueue
+from mijia_clock.connection_manager import ConnectionManager
+
+
+async def _noop():
+    pass
+
+
+def test_commands_share_a_session():
+    async def _test():
+        sessions = []
+
+        async def open_session():
+            sessions.append("open")
+
+        queue = CommandQueue(open_session, _noop, batch_window=0.01)
+        results = await asyncio.gather(
+            queue.submit(lambda: asyncio.sleep(0, "a")),
+            queue.submit(lambda: asyncio.sleep(0, "b"))
+        )
+        assert results == ["a", "b"]
+        assert sessions == ["open"]
+
+    asyncio.run(_test())
+
+
+def test_coalesced_commands_run_once():
+    async def _test():
+        runs = []
+
+        async def run(value):
+            runs.append(value)
+            return value
+
+        queue = CommandQueue(_noop, _noop, batch_window=0.01)
+        first = queue.submit(lambda: run(1), key="unit")
+        second = queue.submit(lambda: run(2), key="unit")
+        assert await asyncio.gather(first, second) == [2, 2]
+        assert runs == [2]
+
+    asyncio.run(_test())
+
+
+def test_cancel_resolves_the_running_batch():
+    async def _test():
+        started = asyncio.Event()
+
+        async def run():
+            started.set()
+            await asyncio.sleep(10)
+
+        queue = CommandQueue(_noop, _noop)
+        running = queue.submit(run)
+        queued = queue.submit(run)
+        await started.wait()
+        queue.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(running, 1)
+        assert queued.cancelled()
+
+    asyncio.run(_test())
+
+
+def test_close_ends_a_command_in_flight():
+    async def _test():
+        clock = SimulatedClock("A4:C1:38:00:00:01", gatt_latency=2)
+        instance = SimulatedMijia(
+            clock,
+            [SimulatedAdapter("sim0", 3)],
+            connection_manager=ConnectionManager(3)
+        )
+        task = asyncio.create_task(instance.set_time(0, 0))
+        # Close once the session of the command is under way
+        while not instance.is_connected:
+            await asyncio.sleep(0.01)
+        await instance.close()
+
+        done, _pending = await asyncio.wait([task], timeout=1)
+        assert done
+
+    asyncio.run(_test())
@@ -0,0 +1,30 @@
+"""Waiting for a connection slot of an adapter."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.simulator import SimulatedAdapter, SimulatedClock, SimulatedMijia
+from mijia_clock import NotConnectedError
+from mijia_clock.connection_manager import ConnectionManager
+
+
+def test_slot_wait_times_out():
+    async def _test():
+        manager = ConnectionManager(1)
+        await manager.acquire("sim0", "A4:C1:38:00:00:02")
+
+        instance = SimulatedMijia(
+            SimulatedClock("A4:C1:38:00:00:01"),
+            [SimulatedAdapter("sim0", 1)],
+            connection_manager=manager
+        )
+        instance.slot_wait_timeout = 0.05
+        with pytest.raises(NotConnectedError):
+            await asyncio.wait_for(instance.connect(), 1)
+
+        assert manager.adapter("sim0").holders == {"A4:C1:38:00:00:02"}
+        assert manager.adapter("sim0").waiting == 0
+        await instance.close()
+
+    asyncio.run(_test())
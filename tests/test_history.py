@@ -0,0 +1,75 @@
+"""History downloads against a simulated clock."""
+
+import asyncio
+import time
+
+from benchmarks.simulator import SimulatedAdapter, SimulatedClock, SimulatedMijia
+from mijia_clock.connection_manager import ConnectionManager
+
+
+def create_clock(records: int) -> tuple[SimulatedClock, SimulatedMijia]:
+    clock = SimulatedClock("A4:C1:38:00:00:01")
+    add_records(clock, records)
+    instance = SimulatedMijia(
+        clock,
+        [SimulatedAdapter("sim0", 3)],
+        connection_manager=ConnectionManager(3)
+    )
+    return clock, instance
+
+
+def add_records(clock: SimulatedClock, records: int):
+    now = int(time.time())
+    for _ in range(records):
+        clock.add_history_record(now, 22.5, 55, 20.0, 45)
+
+
+async def sync(instance: SimulatedMijia) -> list[int]:
+    """Download like the history sync does, moving the cursor past the records."""
+    records = await instance.download_history()
+    if records:
+        instance.set_history_cursor(records[-1].index + 1)
+    return [record.index for record in records]
+
+
+def test_download_moves_on_from_the_cursor():
+    async def _test():
+        clock, instance = create_clock(5)
+        try:
+            assert await sync(instance) == [0, 1, 2, 3, 4]
+            assert instance.history_cursor == 5
+
+            add_records(clock, 2)
+            assert await sync(instance) == [5, 6]
+            assert instance.history_cursor == 7
+        finally:
+            await instance.close()
+
+    asyncio.run(_test())
+
+
+def test_nothing_new_downloads_nothing():
+    async def _test():
+        _clock, instance = create_clock(5)
+        try:
+            await sync(instance)
+            assert await sync(instance) == []
+            assert await sync(instance) == []
+            assert instance.history_cursor == 5
+        finally:
+            await instance.close()
+
+    asyncio.run(_test())
+
+
+def test_reset_clock_downloads_from_the_start():
+    async def _test():
+        _clock, instance = create_clock(3)
+        instance.set_history_cursor(50)
+        try:
+            assert await sync(instance) == [0, 1, 2]
+            assert instance.history_cursor == 3
+        finally:
+            await instance.close()
+
+    asyncio.run(_test())
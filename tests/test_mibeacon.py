@@ -0,0 +1,73 @@
+"""Decoding of MiBeacon advertisements."""
+
+from struct import pack
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+
+from mijia_clock.mibeacon import (
+    BATTERY,
+    HUMIDITY,
+    TEMPERATURE,
+    MiBeaconDecoder,
+    MiBeaconError
+)
+
+MAC = "A4:C1:38:00:00:01"
+MAC_REVERSED = bytes.fromhex(MAC.replace(":", ""))[::-1]
+BINDKEY = bytes(range(16))
+PRODUCT_ID = pack("<H", 0x045B)
+FRAME_COUNTER = b"\x07"
+# Temperature 23.4 °C and humidity 45.6 %
+OBJECTS = pack("<HBhH", 0x100D, 4, 234, 456) + pack("<HBB", 0x100A, 1, 87)
+
+
+def _encrypted_frame(bindkey: bytes = BINDKEY) -> bytes:
+    # Version 5, encrypted, MAC and object included
+    header = pack("<H", 0x5058) + PRODUCT_ID + FRAME_COUNTER + MAC_REVERSED
+    counter_tail = b"\x00\x00\x00"
+    nonce = MAC_REVERSED + PRODUCT_ID + FRAME_COUNTER + counter_tail
+    sealed = AESCCM(bindkey, tag_length=4).encrypt(nonce, OBJECTS, b"\x11")
+    return header + sealed[:-4] + counter_tail + sealed[-4:]
+
+
+def test_decodes_plain_frame():
+    # Version 3, object included
+    frame = MiBeaconDecoder(MAC).decode(
+        pack("<H", 0x3040) + PRODUCT_ID + FRAME_COUNTER + OBJECTS
+    )
+    assert frame.product_id == 0x045B
+    assert frame.frame_counter == 7
+    assert not frame.encrypted
+    assert frame.readings == {TEMPERATURE: 23.4, HUMIDITY: 45.6, BATTERY: 87}
+
+
+def test_decodes_encrypted_frame():
+    frame = MiBeaconDecoder(MAC, BINDKEY).decode(_encrypted_frame())
+    assert frame.encrypted
+    assert frame.readings == {TEMPERATURE: 23.4, HUMIDITY: 45.6, BATTERY: 87}
+
+
+def test_rejects_encrypted_frame_with_the_wrong_bindkey():
+    decoder = MiBeaconDecoder(MAC, bytes(16))
+    with pytest.raises(MiBeaconError):
+        decoder.decode(_encrypted_frame())
+
+    decoder.set_bindkey(None)
+    with pytest.raises(MiBeaconError):
+        decoder.decode(_encrypted_frame())
+
+
+def test_rejects_truncated_frames():
+    decoder = MiBeaconDecoder(MAC, BINDKEY)
+    with pytest.raises(MiBeaconError):
+        decoder.decode(b"\x58\x50\x5b")
+    with pytest.raises(MiBeaconError):
+        decoder.decode(_encrypted_frame()[:13])
+
+
+def test_skips_truncated_objects():
+    frame = MiBeaconDecoder(MAC).decode(
+        pack("<H", 0x3040) + PRODUCT_ID + FRAME_COUNTER + OBJECTS[:7] + pack("<HBB", 0x1006, 2, 1)
+    )
+    assert frame.readings == {TEMPERATURE: 23.4, HUMIDITY: 45.6}
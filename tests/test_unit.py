@@ -0,0 +1,55 @@
+"""Optimistic unit changes against a simulated clock."""
+
+import asyncio
+
+from benchmarks.simulator import SimulatedAdapter, SimulatedClock, SimulatedMijia
+from mijia_clock.connection_manager import ConnectionManager
+from mijia_clock.retry import ExponentialBackoff
+
+
+def create_instance(failure_rate: float = 0.0) -> SimulatedMijia:
+    clock = SimulatedClock("A4:C1:38:00:00:01", failure_rate=failure_rate)
+    return SimulatedMijia(
+        clock,
+        [SimulatedAdapter("sim0", 3)],
+        connection_manager=ConnectionManager(3),
+        retry_policy=ExponentialBackoff(0.01, 0.01)
+    )
+
+
+def test_failed_writes_roll_back_to_the_shown_unit():
+    async def _test():
+        loop_errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: loop_errors.append(context)
+        )
+        instance = create_instance(failure_rate=1.0)
+        instance.use_fahrenheit = False
+        try:
+            futures = [
+                instance.set_use_fahrenheit_optimistic(True),
+                instance.set_use_fahrenheit_optimistic(True)
+            ]
+            assert instance.use_fahrenheit is True
+            await asyncio.gather(*futures, return_exceptions=True)
+            del futures
+        finally:
+            await instance.close()
+
+        assert instance.use_fahrenheit is False
+        assert loop_errors == []
+
+    asyncio.run(_test())
+
+
+def test_successful_write_is_kept():
+    async def _test():
+        instance = create_instance()
+        try:
+            await instance.set_use_fahrenheit_optimistic(True)
+            assert instance.use_fahrenheit is True
+            assert instance.device_store.get(instance.mac)["use_fahrenheit"] is True
+        finally:
+            await instance.close()
+
+    asyncio.run(_test())